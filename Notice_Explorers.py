@@ -2,10 +2,15 @@ import os
 import json
 import re
 import time
-import requests
+import asyncio
+import threading
+import importlib.util
 import cloudscraper
 from bs4 import BeautifulSoup
 
+import http_client
+from storage import store
+
 # ----------------------------
 # 설정
 # ----------------------------
@@ -13,7 +18,23 @@ LIST_URL = "https://api.bithumb.com/v1/notices"
 HEADERS = {"accept": "application/json", "User-Agent": "Mozilla/5.0"}
 OUTPUT_FILE = "airdrop_explorers.json"
 
-scraper = cloudscraper.create_scraper()
+# 봇 내장 크롤러 설정
+CRAWL_PAGE_SIZE = 20
+CRAWL_MAX_PAGES = 3
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "3"))
+CRAWL_MIN_INTERVAL_SEC = float(os.getenv("CRAWL_MIN_INTERVAL_SEC", "0.5"))  # 요청 시작 간 최소 간격
+# 에어드랍 공지인데 아직 이벤트가 안 나온 경우 (거래지원 링크 / 코인 매칭 전) 이 시간 동안 다시 확인
+CRAWL_RECHECK_SEC = float(os.getenv("CRAWL_RECHECK_SEC", "7200"))
+CRAWL_RECHECK_MAX = int(os.getenv("CRAWL_RECHECK_MAX", "20"))
+
+# 페이지 캐시: TTL 이내면 요청 없이 캐시 결과 사용, 이후엔 조건부 요청 (304 → 파싱 생략)
+PAGE_CACHE_TTL_SEC = float(os.getenv("PAGE_CACHE_TTL_SEC", "600"))
+
+# lxml 이 설치돼 있으면 더 빠른 파서 사용
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# cloudscraper 세션은 자체 어댑터로 연결을 재사용 → 어댑터는 그대로 두고 지연 기록만 추가
+scraper = http_client.instrument_session(cloudscraper.create_scraper())
 
 # ----------------------------
 # JSON 저장/불러오기
@@ -31,31 +52,62 @@ def load_airdrops():
 # ----------------------------
 # 크롤링 함수
 # ----------------------------
-def safe_request(url):
+def fetch_page(url, headers=None):
+    return http_client.get(url, session=scraper, headers={**HEADERS, **(headers or {})})
+
+def safe_request(url, headers=None):
     """안전 요청 (2초 지연 포함)"""
     time.sleep(2)
-    return scraper.get(url, headers=HEADERS)
+    return fetch_page(url, headers)
+
+def fetch_cached(url, request, parse):
+    """
+    URL 단위 캐시 (디스크)
+    - TTL 이내: 요청 / 파싱 없이 저장된 추출 결과 반환
+    - 이후: ETag / Last-Modified 로 조건부 요청 → 304 면 파싱 생략
+    """
+    entry = store.get_page_cache(url)
+    if entry and time.time() - entry["fetched_at"] < PAGE_CACHE_TTL_SEC:
+        return entry["result"]
 
-def fetch_recent_notices(size=20):
+    headers = {}
+    if entry and entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    resp = request(url, headers)
+    if resp.status_code == 304 and entry:
+        store.touch_page_cache(url)
+        return entry["result"]
+    resp.raise_for_status()
+
+    result = parse(resp.text)
+    store.set_page_cache(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), result)
+    return result
+
+def fetch_recent_notices(size=20, page=1):
     """최근 공지 size개 가져오기"""
-    resp = scraper.get(   # 🔥 requests → scraper
+    resp = http_client.get(   # 🔥 requests → scraper
         LIST_URL,
+        session=scraper,
         headers=HEADERS,
-        params={"page": 1, "count": size}
+        params={"page": page, "count": size}
     )
     resp.raise_for_status()
     return resp.json()
 
-def fetch_notice_links(url):
-    """이벤트 공지에서 거래지원 안내 링크 추출"""
-    try:
-        resp = safe_request(url)
-        resp.raise_for_status()
-    except Exception as e:
-        print(f"⚠️ 링크 요청 실패 ({url}) → {e}")
-        return []
+def notice_id(item):
+    """공지 URL 의 /notice/<id> 에서 id 추출"""
+    match = re.search(r"/notice/(\d+)", item.get("pc_url") or "")
+    return int(match.group(1)) if match else None
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+def fetch_notice_links(url, request=safe_request):
+    """이벤트 공지에서 거래지원 안내 링크 추출 (요청 실패는 예외 그대로 → 호출 쪽에서 재시도 판단)"""
+    return fetch_cached(url, request, parse_notice_links)
+
+def parse_notice_links(html):
+    soup = BeautifulSoup(html, HTML_PARSER)
     content_div = soup.select_one("div[class^=NoticeDetailContent_detail-content]")
     if not content_div:
         return []
@@ -70,11 +122,12 @@ def fetch_notice_links(url):
             links.append({"text": text, "url": full_url})
     return links
 
-def fetch_coins_and_explorers(url):
+def fetch_coins_and_explorers(url, request=safe_request):
     """거래지원 안내 공지에서 코인 심볼 + 블록 익스플로러 추출"""
-    resp = safe_request(url)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    return fetch_cached(url, request, parse_coins_and_explorers)
+
+def parse_coins_and_explorers(html):
+    soup = BeautifulSoup(html, HTML_PARSER)
 
     # 제목에서 코인 심볼 추출
     title_tag = soup.select_one("h2, h3, [class^=NoticeDetailHeader_title__]")
@@ -108,34 +161,26 @@ def detect_chain(url):
     if "solscan.io" in url: return "SOL"
     return "mainnet"
 
-# ----------------------------
-# 실행
-# ----------------------------
-if __name__ == "__main__":
-    old_data = load_airdrops()
-    new_data = []
-
-    notices = fetch_recent_notices(size=20)
-
-for item in notices:
+def build_event(item, request=safe_request):
+    """에어드랍 이벤트 공지 1개 → {"event_title", "event_url", "coins"} (해당 없으면 None)"""
     title = item.get("title", "")
     url = item.get("pc_url")
 
     # 에어드랍 이벤트만 추출
     if "에어드랍" not in title:
-        continue
+        return None
 
     print(f"📌 이벤트 공지: {title}")
     print("URL:", url)
 
     # 이벤트 공지에서 거래지원 안내 링크 추출
-    support_links = fetch_notice_links(url)
+    support_links = fetch_notice_links(url, request)
     print("거래지원 안내 링크:", len(support_links), "개")
 
     # ✅ 링크가 없으면 그냥 넘어감
     if not support_links:
         print("⚠️ 거래지원 안내 링크 없음 → 스킵")
-        continue
+        return None
 
     record = {
         "event_title": title,
@@ -146,14 +191,131 @@ for item in notices:
     event_coins = re.findall(r"\(([A-Za-z0-9]+)\)", title)
 
     for link in support_links:
-        matched = fetch_coins_and_explorers(link["url"])
+        matched = fetch_coins_and_explorers(link["url"], request)
         matched = [c for c in matched if c["coin"] in event_coins]
         record["coins"].extend(matched)
 
-    if record["coins"]:
-        new_data.append(record)
+    return record if record["coins"] else None
+
+def crawl_airdrops(size=20):
+    """최근 공지 size개 전체 크롤링 (단독 실행용)"""
+    new_data = []
+    for item in fetch_recent_notices(size=size):
+        try:
+            record = build_event(item)
+        except Exception as e:
+            print(f"⚠️ 공지 크롤링 실패 ({item.get('pc_url')}) → {e}")
+            continue
+        if record:
+            new_data.append(record)
+    return new_data
+
+
+# ----------------------------
+# 봇 내장 비동기 크롤러 (새 공지만)
+# ----------------------------
+class RateLimiter:
+    """요청 시작 간격을 min_interval 이상으로 유지 (워커 스레드 공용)"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.min_interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+class NoticeCrawler:
+    """
+    마지막으로 본 공지 id 이후의 공지만 가져오고,
+    에어드랍 공지 상세 페이지는 동시에(CRAWL_CONCURRENCY) 제한된 속도로 크롤링한다.
+    이벤트가 아직 안 나온 에어드랍 공지는 CRAWL_RECHECK_SEC 동안 last_seen 을 그 앞에 두고 다시 확인한다.
+    """
+
+    def __init__(self, load_last_seen, save_last_seen):
+        self.load_last_seen = load_last_seen
+        self.save_last_seen = save_last_seen
+        self.last_seen = load_last_seen()
+        self.recheck = {}   # 공지 id → 재확인 마감 시각 (이벤트 없는 에어드랍 공지)
+        self.limiter = RateLimiter(CRAWL_MIN_INTERVAL_SEC)
+        self.semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
+
+    def _request(self, url, headers=None):
+        self.limiter.wait()
+        return fetch_page(url, headers)
 
+    async def fetch_new_notices(self):
+        """last_seen 보다 새 공지 (최대 CRAWL_MAX_PAGES 페이지)"""
+        new_items = []
+        for page in range(1, CRAWL_MAX_PAGES + 1):
+            items = await asyncio.to_thread(fetch_recent_notices, CRAWL_PAGE_SIZE, page)
+            fresh = [item for item in items if self.last_seen is None or (notice_id(item) or 0) > self.last_seen]
+            new_items.extend(fresh)
+            # 처음 실행이거나 이미 본 공지에 도달하면 중단
+            if self.last_seen is None or len(fresh) < len(items) or not items:
+                break
+        return new_items
 
+    async def _build(self, item):
+        """(성공 여부, 이벤트)"""
+        async with self.semaphore:
+            try:
+                return True, await asyncio.to_thread(build_event, item, self._request)
+            except Exception as e:
+                print(f"⚠️ 공지 크롤링 실패 ({item.get('pc_url')}) → {e}")
+                return False, None
 
+    async def poll(self):
+        """새 에어드랍 이벤트 리스트 (공지 목록 순서 유지)"""
+        items = await self.fetch_new_notices()
+        if not items:
+            return []
+
+        results = await asyncio.gather(*(self._build(item) for item in items))
+
+        # 실패한 공지 / 재확인 중인 공지는 다음 poll 때 다시 가져오도록 그 앞까지만 last_seen 갱신
+        ids = [notice_id(item) for item in items if notice_id(item) is not None]
+        failed = [notice_id(item) for item, (ok, _) in zip(items, results) if not ok and notice_id(item) is not None]
+        held = failed + self._update_recheck(items, results)
+        if ids:
+            new_last_seen = min(held) - 1 if held else max(ids)
+            if self.last_seen is None or new_last_seen > self.last_seen:
+                self.last_seen = new_last_seen
+                self.save_last_seen(self.last_seen)
+
+        return [event for _, event in results if event]
+
+    def _update_recheck(self, items, results) -> list:
+        """이벤트 없는 에어드랍 공지 재확인 목록 갱신 → 아직 마감 전인 공지 id"""
+        now = time.monotonic()
+        seen = set()
+        for item, (ok, event) in zip(items, results):
+            nid = notice_id(item)
+            if nid is None:
+                continue
+            seen.add(nid)
+            if ok and event is None and "에어드랍" in item.get("title", ""):
+                self.recheck.setdefault(nid, now + CRAWL_RECHECK_SEC)
+            elif ok:
+                self.recheck.pop(nid, None)
+
+        # 마감 지남 / 이번 목록에 없음(페이지 범위 밖) → 포기, 개수 제한은 오래된 공지부터 제외
+        self.recheck = {nid: deadline for nid, deadline in self.recheck.items() if deadline > now and nid in seen}
+        for nid in sorted(self.recheck)[:-CRAWL_RECHECK_MAX or None]:
+            del self.recheck[nid]
+        return list(self.recheck)
+
+
+# ----------------------------
+# 실행
+# ----------------------------
+if __name__ == "__main__":
+    new_data = crawl_airdrops(size=20)
     save_airdrops(new_data)
     print(f"\n✅ {OUTPUT_FILE} 저장 완료 ({len(new_data)}건)")
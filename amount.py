@@ -1,15 +1,16 @@
 # amount.py
-import requests
-import os
 from dotenv import load_dotenv
 
+import http_client
+from chain_backends import lazy
+
 load_dotenv()
-SOL_RPC_URL = os.getenv("RPC_URL")
-SOL_ADDRESS = os.getenv("SOL_ADDRESS")   # 내 지갑 주소 환경변수에서 가져오기
+SOL_RPC_URL = http_client.SOL_RPC_URL
+get_keypair = lazy("sol_coin", "get_keypair")   # 스왑 지갑 (핫월렛 풀의 기본 지갑)
 
 def get_amount_from_tx(tx_hash: str) -> float:
     """
-    Solana 트랜잭션에서 SOL_ADDRESS 기준으로 받은 SPL 토큰을 찾아
+    Solana 트랜잭션에서 스왑 지갑 기준으로 받은 SPL 토큰을 찾아
     실제 수량의 1/20 값 반환
     """
     try:
@@ -23,7 +24,7 @@ def get_amount_from_tx(tx_hash: str) -> float:
                 {"encoding": "jsonParsed", "commitment": "confirmed", "maxSupportedTransactionVersion": 0},
             ],
         }
-        resp = requests.post(SOL_RPC_URL, headers=headers, json=payload)
+        resp = http_client.post(SOL_RPC_URL, headers=headers, json=payload)
         data = resp.json()
 
         if "result" not in data or data["result"] is None:
@@ -36,9 +37,10 @@ def get_amount_from_tx(tx_hash: str) -> float:
         pre_tokens = {t["accountIndex"]: t for t in meta.get("preTokenBalances", [])}
         post_tokens = {t["accountIndex"]: t for t in meta.get("postTokenBalances", [])}
 
+        owner = str(get_keypair().pubkey())
         buy_amount = 0.0
         for idx, post in post_tokens.items():
-            if post["owner"] == SOL_ADDRESS:
+            if post["owner"] == owner:
                 pre_amount = int(pre_tokens.get(idx, {}).get("uiTokenAmount", {}).get("amount", 0))
                 post_amount = int(post["uiTokenAmount"]["amount"])
                 diff = post_amount - pre_amount
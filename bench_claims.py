@@ -0,0 +1,425 @@
+"""
+클레임 파이프라인 부하 테스트 (로컬 대역 서버 사용 — 메인넷 / 실제 자금 X)
+- 가짜 Solana JSON-RPC 서버 (메서드별 호출 수 집계)
+- 가짜 OKX 애그리게이터 (swap / swap-instruction 고정 응답)
+- ETH: 로컬 anvil (메인넷 포크 모드, Disperse 컨트랙트 필요) 앞에 호출 수 집계 프록시
+- 가짜 디스코드 Interaction 으로 WalletModal.on_submit 을 동시에 실행
+결과: claims/sec, p50 / p99 지연, 클레임당 RPC 호출 수
+
+실행:
+  python bench_claims.py --claims 2000
+  python bench_claims.py --chain eth --anvil http://127.0.0.1:8545 --eth-token 0x... --eth-whale 0x...
+  (--swaps N: 등록 스왑 N회도 측정)
+"""
+import os
+import json
+import time
+import base64
+import struct
+import asyncio
+import argparse
+import tempfile
+import threading
+from collections import Counter
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import base58
+import requests
+
+# anvil 기본 계정 #0 (로컬 테스트 전용 공개 키)
+ANVIL_ADDRESS = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+ANVIL_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+SPL_TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+COMPUTE_BUDGET_PROGRAM = "ComputeBudget111111111111111111111111111111"
+LOOKUP_TABLE_PROGRAM = "AddressLookupTab1e1111111111111111111111111"
+LOOKUP_TABLE_META_SIZE = 56
+BENCH_DECIMALS = 6
+CLAIM_AMOUNT = 1.0
+
+
+# -------------------------------------------------------------------
+# 🔹 RPC 호출 수 집계
+# -------------------------------------------------------------------
+class RpcCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = Counter()
+
+    def add(self, method: str):
+        with self._lock:
+            self.calls[method] += 1
+
+    def snapshot(self) -> Counter:
+        with self._lock:
+            return Counter(self.calls)
+
+
+def serve(handler_cls) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_cls)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=handler_cls.__name__, daemon=True).start()
+    return server
+
+
+def server_url(server) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive (실서버와 같은 커넥션 재사용)
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length", "0"))
+        return json.loads(self.rfile.read(length) or b"null")
+
+
+# -------------------------------------------------------------------
+# 🔹 가짜 Solana JSON-RPC
+# -------------------------------------------------------------------
+def first_signature(raw_tx: bytes) -> str:
+    """직렬화된 트랜잭션의 첫 번째 서명 (compact-u16 개수 + 64바이트 서명들)"""
+    offset = 1 if raw_tx[0] < 0x80 else 2
+    return base58.b58encode(raw_tx[offset:offset + 64]).decode()
+
+
+def lookup_table_data(addresses: list) -> bytes:
+    """온체인 ALT 계정 데이터 (ProgramState::LookupTable + 메타 56바이트 + 주소 목록)"""
+    meta = struct.pack("<IQQB", 1, 2**64 - 1, 0, 0) + b"\x00" + b"\x00\x00"   # 활성 / authority 없음 / padding
+    return meta.ljust(LOOKUP_TABLE_META_SIZE, b"\x00") + b"".join(base58.b58decode(a) for a in addresses)
+
+
+def account_json(data: bytes, owner: str) -> dict:
+    return {
+        "data": [base64.b64encode(data).decode(), "base64"],
+        "executable": False, "lamports": 1_461_600, "owner": owner, "rentEpoch": 0, "space": len(data),
+    }
+
+
+def make_solana_handler(counter: RpcCounter, blockhash: str, lookup_tables: dict):
+    """lookup_tables: ALT 주소 → 담긴 주소 목록 (getMultipleAccounts 로 실제 계정 형식 응답)"""
+    context = {"slot": 1000}
+
+    def result_for(method, params):
+        if method == "getHealth":
+            return "ok"
+        if method == "getLatestBlockhash":
+            return {"context": context, "value": {"blockhash": blockhash, "lastValidBlockHeight": 10_000_000}}
+        if method == "getBlockHeight":
+            return 900
+        if method == "getAccountInfo":
+            return {"context": context, "value": account_json(bytes(82), SPL_TOKEN_PROGRAM)}
+        if method == "getMultipleAccounts":
+            return {"context": context, "value": [
+                account_json(lookup_table_data(lookup_tables[a]), LOOKUP_TABLE_PROGRAM) if a in lookup_tables else None
+                for a in params[0]
+            ]}
+        if method == "getTokenSupply":
+            return {"context": context, "value": {
+                "amount": "1000000000000", "decimals": BENCH_DECIMALS,
+                "uiAmount": 1_000_000.0, "uiAmountString": "1000000",
+            }}
+        if method == "getTokenAccountBalance":
+            return {"context": context, "value": {
+                "amount": "1000000000000", "decimals": 9, "uiAmount": 1000.0, "uiAmountString": "1000",
+            }}
+        if method == "getRecentPrioritizationFees":
+            return [{"slot": 1000 - i, "prioritizationFee": fee} for i, fee in enumerate((0, 5000, 10000, 20000))]
+        if method == "sendTransaction":
+            config = params[1] if len(params) > 1 else {}
+            raw = base64.b64decode(params[0]) if config.get("encoding") == "base64" else base58.b58decode(params[0])
+            return first_signature(raw)
+        if method == "getSignatureStatuses":
+            return {"context": context, "value": [
+                {"slot": 999, "confirmations": None, "err": None, "status": {"Ok": None}, "confirmationStatus": "confirmed"}
+                for _ in params[0]
+            ]}
+        raise KeyError(method)
+
+    class SolanaRPC(QuietHandler):
+        def do_POST(self):
+            request = self.read_json()
+            batch = request if isinstance(request, list) else [request]
+            responses = []
+            for req in batch:
+                counter.add(req["method"])
+                try:
+                    responses.append({"jsonrpc": "2.0", "id": req["id"], "result": result_for(req["method"], req.get("params") or [])})
+                except KeyError:
+                    responses.append({"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32601, "message": "Method not found"}})
+            self.send_json(responses if isinstance(request, list) else responses[0])
+
+    return SolanaRPC
+
+
+# -------------------------------------------------------------------
+# 🔹 anvil 앞단 집계 프록시
+# -------------------------------------------------------------------
+def make_proxy_handler(counter: RpcCounter, upstream: str):
+    session = requests.Session()
+
+    class CountingProxy(QuietHandler):
+        def do_POST(self):
+            request = self.read_json()
+            for req in request if isinstance(request, list) else [request]:
+                counter.add(req["method"])
+            self.send_json(session.post(upstream, json=request, timeout=30).json())
+
+    return CountingProxy
+
+
+# -------------------------------------------------------------------
+# 🔹 가짜 OKX 애그리게이터
+# -------------------------------------------------------------------
+def make_okx_handler(counter: RpcCounter, lookup_tables: dict):
+    """Solana 스왑 instruction 은 lookup_tables 의 주소를 읽기 전용 계정으로 참조한다"""
+    table_accounts = [
+        {"pubkey": address, "isSigner": False, "isWritable": False}
+        for addresses in lookup_tables.values() for address in addresses
+    ]
+
+    class FakeOKX(QuietHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            counter.add("okx:" + url.path.rsplit("/", 1)[-1])
+            wallet = params.get("userWalletAddress")
+            amount = int(params.get("amount", "0"))
+
+            if url.path.endswith("/swap"):
+                # 자기 자신에게 ETH 전송하는 트랜잭션 (anvil 에서 그대로 성공)
+                tx = {"from": wallet, "to": wallet, "data": "0x", "value": str(amount),
+                      "gas": "21000", "gasPrice": str(100 * 10**9)}
+                self.send_json({"code": "0", "data": [{"tx": tx}]})
+            elif url.path.endswith("/swap-instruction"):
+                # ComputeBudget (제거 대상) + 자기 자신에게 SOL 전송 (+ ALT 로 압축될 계정들)
+                self.send_json({"code": "0", "data": {
+                    "addressLookupTableAccount": list(lookup_tables),
+                    "instructionLists": [
+                        {"programId": COMPUTE_BUDGET_PROGRAM, "accounts": [],
+                         "data": base64.b64encode(struct.pack("<BI", 2, 300_000)).decode()},
+                        {"programId": SYSTEM_PROGRAM, "accounts": [
+                            {"pubkey": wallet, "isSigner": True, "isWritable": True},
+                            {"pubkey": wallet, "isSigner": False, "isWritable": True},
+                        ] + table_accounts, "data": base64.b64encode(struct.pack("<IQ", 2, amount)).decode()},
+                    ],
+                }})
+            else:
+                self.send_json({"code": "404", "msg": "unknown path", "data": []})
+
+    return FakeOKX
+
+
+# -------------------------------------------------------------------
+# 🔹 가짜 디스코드 Interaction
+# -------------------------------------------------------------------
+class FakeInteraction:
+    def __init__(self, user_id: int):
+        self.user = SimpleNamespace(id=user_id, mention=f"<@{user_id}>")
+        self.started = time.perf_counter()
+        self.finished = None
+        self.result = None
+        self.response = SimpleNamespace(defer=self._defer, send_message=self._send)
+        self.followup = SimpleNamespace(send=self._send)
+
+    async def _defer(self, **kwargs):
+        pass
+
+    async def _send(self, content=None, **kwargs):
+        self.finished = time.perf_counter()
+        self.result = content or ""
+
+    @property
+    def ok(self) -> bool:
+        return self.result is not None and self.result.startswith("🤗")
+
+
+# -------------------------------------------------------------------
+# 🔹 환경 구성 (봇 모듈 import 전에 env 설정)
+# -------------------------------------------------------------------
+def setup_env(args, counter: RpcCounter) -> dict:
+    from solders.keypair import Keypair
+
+    env = {"BOT_DB_FILE": "bench.db", "OKX_API_KEY": "bench", "OKX_SECRET_KEY": "bench",
+           "OKX_API_PASSPHRASE": "bench", "OKX_PROJECT_ID": "bench", "HTTP_RETRIES": "0"}
+
+    # OKX 라우트가 참조하는 Address Lookup Table 1개 (주소 8개)
+    lookup_tables = {str(Keypair().pubkey()): [str(Keypair().pubkey()) for _ in range(8)]}
+
+    okx = serve(make_okx_handler(counter, lookup_tables))
+    env["OKX_BASE_URL"] = server_url(okx)
+
+    sender = Keypair()
+    blockhash = str(Keypair().pubkey())  # 32바이트 base58 → blockhash 대용
+    sol_rpc = serve(make_solana_handler(counter, blockhash, lookup_tables))
+    env.update(RPC_URL=server_url(sol_rpc), SOL_PRIVATE_KEYS=str(sender))
+
+    if args.anvil:
+        proxy = serve(make_proxy_handler(counter, args.anvil))
+        env.update(INFURA_URL=server_url(proxy), ETH_PRIVATE_KEYS=ANVIL_PRIVATE_KEY)
+
+    os.environ.update(env)
+    return env
+
+
+def anvil_rpc(url: str, method: str, params: list):
+    resp = requests.post(url, json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params}, timeout=30).json()
+    if "error" in resp:
+        raise RuntimeError(f"{method}: {resp['error']}")
+    return resp["result"]
+
+
+def fund_from_whale(args, total_raw: int):
+    """포크된 anvil 에서 whale 계정을 가장해 벤치 계정으로 토큰 이동 (집계 대상 아님)"""
+    to = ANVIL_ADDRESS[2:].lower().rjust(64, "0")
+    data = "0xa9059cbb" + to + hex(total_raw)[2:].rjust(64, "0")  # transfer(address,uint256)
+    anvil_rpc(args.anvil, "anvil_impersonateAccount", [args.eth_whale])
+    anvil_rpc(args.anvil, "anvil_setBalance", [args.eth_whale, hex(10**18)])
+    anvil_rpc(args.anvil, "eth_sendTransaction", [{"from": args.eth_whale, "to": args.eth_token, "data": data}])
+    anvil_rpc(args.anvil, "anvil_stopImpersonatingAccount", [args.eth_whale])
+
+
+def random_wallet(chain: str) -> str:
+    if chain == "eth":
+        return "0x" + os.urandom(20).hex()
+    from solders.keypair import Keypair
+    return str(Keypair().pubkey())
+
+
+# -------------------------------------------------------------------
+# 🔹 측정
+# -------------------------------------------------------------------
+def pct(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def print_calls(label: str, calls: Counter, per: int):
+    total = sum(calls.values())
+    print(f"{label}: 총 {total}회 ({total / max(per, 1):.3f}회/건)")
+    for method, count in calls.most_common():
+        print(f"   {method:<32} {count:>7}  ({count / max(per, 1):.3f}/건)")
+
+
+async def run_claims(dc, symbol: str, chain: str, count: int, counter: RpcCounter):
+    interactions = []
+
+    async def one(i):
+        modal = dc.WalletModal(symbol)
+        modal.wallet._value = random_wallet(chain)
+        interaction = FakeInteraction(10**12 + i)
+        interactions.append(interaction)
+        await modal.on_submit(interaction)
+
+    before = counter.snapshot()
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    elapsed = time.perf_counter() - start
+    calls = counter.snapshot() - before
+    dc.claim_ledger.flush()
+
+    ok = [it for it in interactions if it.ok]
+    latencies = [it.finished - it.started for it in ok]
+    print(f"\n📊 클레임 {count}건 ({chain}) — 성공 {len(ok)} / 실패 {count - len(ok)}")
+    print(f"처리량     {len(ok) / elapsed:.1f} claims/sec  (총 {elapsed:.2f}s)")
+    print(f"지연       p50 {pct(latencies, 50) * 1000:.0f}ms  p99 {pct(latencies, 99) * 1000:.0f}ms  "
+          f"max {max(latencies, default=0) * 1000:.0f}ms")
+    print_calls("RPC 호출", calls, len(ok))
+    failures = Counter(it.result for it in interactions if not it.ok)
+    for message, n in failures.most_common(3):
+        print(f"⚠️ 실패 {n}건: {message}")
+
+
+async def run_swaps(dc, address: str, chain: str, count: int, counter: RpcCounter):
+    """등록 스왑: 바로 요청 (OKX + RPC) / 사전 준비된 데이터로 서명 + 전송만 — 두 경우 모두 측정"""
+    from prewarm import register_buy_amount, PREPARE_FUNCS
+
+    fn = dc.swap_eth_to_token if chain == "eth" else dc.swap_sol_to_token_instruction
+    prepared_kwarg = "prepared_tx" if chain == "eth" else "prepared"
+
+    for label, prewarmed in (("요청 시 준비", False), ("사전 준비", True)):
+        latencies = []
+        calls = Counter()
+        for _ in range(count):
+            kwargs = {}
+            if prewarmed:
+                payload = await dc.transfer_executor.run(chain, PREPARE_FUNCS[chain], address)
+                kwargs[prepared_kwarg] = payload["swap"]
+            before = counter.snapshot()
+            start = time.perf_counter()
+            await dc.transfer_executor.run(chain, fn, address, register_buy_amount(chain), **kwargs)
+            latencies.append(time.perf_counter() - start)
+            calls += counter.snapshot() - before
+
+        print(f"\n📊 등록 스왑 {count}회 ({chain}, {label})")
+        print(f"지연       p50 {pct(latencies, 50) * 1000:.0f}ms  p99 {pct(latencies, 99) * 1000:.0f}ms")
+        print_calls("RPC / OKX 호출 (클릭 이후)", calls, count)
+
+
+async def main(args):
+    counter = RpcCounter()
+    setup_env(args, counter)
+
+    # 봇 파일(bot.db / token_cache.json)이 실제 운영 파일과 섞이지 않도록 임시 폴더에서 실행
+    workdir = tempfile.mkdtemp(prefix="bench_claims_")
+    os.chdir(workdir)
+    print(f"📁 작업 폴더: {workdir}")
+
+    import discord_coin as dc
+    from chain_backends import init_backends
+
+    await asyncio.to_thread(init_backends)
+
+    if args.chain == "eth":
+        address = args.eth_token
+        decimals = await asyncio.to_thread(dc.get_erc20_decimals, address)
+        if args.eth_whale:
+            fund_from_whale(args, int(args.claims * CLAIM_AMOUNT * 10**decimals))
+    else:
+        address = random_wallet("sol")  # 가짜 RPC 는 어떤 mint 든 SPL 토큰으로 응답
+        decimals = BENCH_DECIMALS
+
+    symbol = "bench"
+    dc.add_token_first(symbol, {"chain": args.chain, "address": address, "decimals": decimals, "amount": CLAIM_AMOUNT})
+
+    await run_claims(dc, symbol, args.chain, args.claims, counter)
+    if args.swaps:
+        await run_swaps(dc, address, args.chain, args.swaps, counter)
+
+    dc.claim_ledger.flush()
+    dc.transfer_executor.shutdown()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="클레임 파이프라인 부하 테스트 (로컬 대역 서버)")
+    parser.add_argument("--claims", type=int, default=1000, help="동시에 보낼 WalletModal 제출 수")
+    parser.add_argument("--chain", choices=["sol", "eth"], default="sol")
+    parser.add_argument("--swaps", type=int, default=0, help="등록 스왑(OKX) 측정 횟수")
+    parser.add_argument("--anvil", help="로컬 anvil RPC URL (eth 필수, 메인넷 포크 모드)")
+    parser.add_argument("--eth-token", help="포크된 체인의 ERC20 주소")
+    parser.add_argument("--eth-whale", help="벤치 계정에 토큰을 넣어줄 보유자 주소 (impersonate)")
+    args = parser.parse_args()
+    if args.chain == "eth" and not (args.anvil and args.eth_token):
+        parser.error("--chain eth 는 --anvil 과 --eth-token 이 필요합니다")
+    return args
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,58 @@
+"""
+봇 시작 시간 측정
+- import: 새 파이썬 프로세스에서 `import discord_coin` 소요 시간
+- first-ready: 체인 백엔드 로딩 + RPC 연결 확인까지 소요 시간 (로그인 후 백그라운드 작업)
+
+실행: python bench_startup.py [반복 횟수]
+"""
+import sys
+import json
+import subprocess
+import statistics
+
+IMPORT_SNIPPET = """
+import time, json
+start = time.perf_counter()
+import discord_coin
+import_sec = time.perf_counter() - start
+heavy = [m for m in ("web3", "solana", "solders", "spl", "nacl") if m in __import__("sys").modules]
+print(json.dumps({"import_sec": import_sec, "heavy_loaded": heavy}))
+"""
+
+READY_SNIPPET = """
+import time, json
+start = time.perf_counter()
+from chain_backends import init_backends
+report = init_backends()
+report["total_sec"] = time.perf_counter() - start
+print(json.dumps(report))
+"""
+
+
+def run_snippet(code: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(label: str, values: list):
+    print(f"{label:<14} min {min(values):.3f}s  median {statistics.median(values):.3f}s  max {max(values):.3f}s")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    imports, readies = [], []
+    for _ in range(runs):
+        result = run_snippet(IMPORT_SNIPPET)
+        imports.append(result["import_sec"])
+        if result["heavy_loaded"]:
+            print(f"⚠️ import 시점에 무거운 모듈 로딩됨: {result['heavy_loaded']}")
+
+        ready = run_snippet(READY_SNIPPET)
+        readies.append(ready["total_sec"])
+
+    print(f"📊 startup benchmark ({runs}회)")
+    summarize("import", imports)
+    summarize("first-ready", readies)
+    print("모듈별 import:", {k: round(v, 3) for k, v in ready["imports"].items()})
+    print("RPC 연결:", ready["connectivity"])
@@ -0,0 +1,269 @@
+import os
+import time
+import threading
+from dotenv import load_dotenv
+
+from solders.signature import Signature
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+BLOCKHASH_REFRESH_SEC = float(os.getenv("BLOCKHASH_REFRESH_SEC", "5"))
+# blockhash 는 약 150 블록(≈60초) 유효 → 여유 있게 20초 지나면 직접 갱신
+BLOCKHASH_MAX_AGE_SEC = float(os.getenv("BLOCKHASH_MAX_AGE_SEC", "20"))
+BLOCKHASH_SEND_RETRIES = 2
+# 전송한 트랜잭션 확인 주기 / 만료(블록 높이 초과) 시 재전송 최대 횟수
+RESEND_POLL_SEC = float(os.getenv("SOL_RESEND_POLL_SEC", "2"))
+RESEND_MAX = int(os.getenv("SOL_RESEND_MAX", "3"))
+RESEND_ALIAS_TTL_SEC = 600   # 재전송된 서명 매핑 보관 시간 (확정 추적기가 조회할 수 있도록)
+
+
+def is_blockhash_error(e: Exception) -> bool:
+    msg = str(e).lower()
+    return "blockhash not found" in msg or "blockhashnotfound" in msg or "block height exceeded" in msg
+
+
+# -------------------------------------------------------------------
+# 🔹 최신 blockhash 백그라운드 갱신
+# -------------------------------------------------------------------
+class BlockhashCache:
+    """최신 blockhash 와 last valid block height 를 메모리에 유지 (몇 초마다 갱신)"""
+
+    def __init__(self, client, refresh_sec: float = BLOCKHASH_REFRESH_SEC, max_age_sec: float = BLOCKHASH_MAX_AGE_SEC):
+        self.client = client
+        self.refresh_sec = refresh_sec
+        self.max_age_sec = max_age_sec
+        self._lock = threading.Lock()
+        self._blockhash = None
+        self._last_valid_block_height = None
+        self._fetched_at = 0.0
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="blockhash-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ blockhash 갱신 실패: {e}")
+            self._stop.wait(self.refresh_sec)
+
+    def refresh(self):
+        value = self.client.get_latest_blockhash().value
+        with self._lock:
+            self._blockhash = value.blockhash
+            self._last_valid_block_height = value.last_valid_block_height
+            self._fetched_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._fetched_at = 0.0
+
+    def get(self) -> tuple:
+        """(blockhash, last_valid_block_height) — 오래됐으면 그 자리에서 갱신"""
+        self.start()
+        with self._lock:
+            fresh = self._blockhash is not None and time.monotonic() - self._fetched_at < self.max_age_sec
+            if fresh:
+                return self._blockhash, self._last_valid_block_height
+        self.refresh()
+        with self._lock:
+            return self._blockhash, self._last_valid_block_height
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_blockhash_cache(client) -> BlockhashCache:
+    """Solana 트랜잭션 빌더 전체가 공유하는 인스턴스"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = BlockhashCache(client)
+        return _cache
+
+
+# -------------------------------------------------------------------
+# 🔹 전송한 트랜잭션 만료 감시 → 새 blockhash 로 재서명 후 재전송
+# -------------------------------------------------------------------
+def is_landed(status) -> bool:
+    """확정(confirmed / finalized) 또는 실패로 끝난 상태 (processed 는 아직 롤백될 수 있음)"""
+    if status is None:
+        return False
+    if status.err is not None:
+        return True
+    level = str(status.confirmation_status or "").lower()
+    return "confirmed" in level or "finalized" in level
+
+
+class ExpiryResender:
+    """
+    skip_preflight 로 보내면 RPC 가 blockhash 만료를 알려주지 않으므로,
+    보낸 서명을 확정될 때까지 추적하다가 블록 높이가 last_valid_block_height 를 넘도록
+    체인에 없으면 (= 더 이상 포함될 수 없으면) 새 blockhash 로 다시 서명해서 보낸다.
+    """
+
+    def __init__(self, client, cache: BlockhashCache, poll_sec: float = RESEND_POLL_SEC, max_resends: int = RESEND_MAX):
+        self.client = client
+        self.cache = cache
+        self.poll_sec = poll_sec
+        self.max_resends = max_resends
+        self._lock = threading.Lock()
+        self._pending = {}   # 현재 서명 → {"origin", "build_tx", "opts", "last_valid", "resends"}
+        self._aliases = {}   # 최초 서명 → (현재 서명, 갱신 시각)
+        self._thread = None
+        self._wake = threading.Event()
+
+    def watch(self, sig: str, build_tx, opts, last_valid_block_height: int):
+        with self._lock:
+            self._pending[sig] = {
+                "origin": sig, "build_tx": build_tx, "opts": opts,
+                "last_valid": last_valid_block_height, "resends": 0,
+            }
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sol-resender", daemon=True)
+                self._thread.start()
+
+    def current(self, sig: str) -> str:
+        """재전송됐으면 마지막으로 보낸 서명, 아니면 그대로"""
+        with self._lock:
+            alias = self._aliases.get(str(sig))
+        return alias[0] if alias else str(sig)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_sec)
+            self._wake.clear()
+            try:
+                self.check()
+            except Exception as e:
+                print(f"⚠️ 트랜잭션 만료 감시 실패: {e}")
+
+    def check(self):
+        with self._lock:
+            sigs = list(self._pending)
+            now = time.monotonic()
+            for origin in [o for o, (_, at) in self._aliases.items() if now - at > RESEND_ALIAS_TTL_SEC]:
+                del self._aliases[origin]
+        if not sigs:
+            return
+
+        missing = []
+        for sig, status in self._statuses(sigs).items():
+            if is_landed(status):
+                self._done(sig)
+            elif status is None:
+                missing.append(sig)
+        if not missing:
+            return
+
+        # 체인에 없는 것만 블록 높이와 비교 (조회 1회)
+        height = self.client.get_block_height().value
+        with self._lock:
+            expired = [sig for sig in missing if sig in self._pending and height > self._pending[sig]["last_valid"]]
+        if not expired:
+            return
+
+        # 최근 상태 캐시에서 밀려났을 뿐 이미 포함된 트랜잭션일 수 있음 (check 가 밀린 경우)
+        # → 전체 기록까지 조회해서 그래도 없을 때만 재전송 (이중 지급 방지)
+        for sig, status in self._statuses(expired, search_history=True).items():
+            if status is None:
+                with self._lock:
+                    entry = self._pending.get(sig)
+                if entry is not None:
+                    self._resend(sig, entry)
+            elif is_landed(status):
+                self._done(sig)
+
+    def _statuses(self, sigs: list, search_history: bool = False) -> dict:
+        result = {}
+        for start in range(0, len(sigs), 256):
+            chunk = sigs[start:start + 256]
+            statuses = self.client.get_signature_statuses(
+                [Signature.from_string(s) for s in chunk], search_transaction_history=search_history
+            ).value
+            result.update(zip(chunk, statuses))
+        return result
+
+    def _done(self, sig: str):
+        with self._lock:
+            self._pending.pop(sig, None)
+
+    def _resend(self, sig: str, entry: dict):
+        with self._lock:
+            self._pending.pop(sig, None)
+        if entry["resends"] >= self.max_resends:
+            print(f"❌ 트랜잭션 만료 — 재전송 {entry['resends']}회 후 포기: {entry['origin']}")
+            return
+
+        self.cache.invalidate()
+        blockhash, last_valid = self.cache.get()
+        try:
+            new_sig = str(self.client.send_raw_transaction(bytes(entry["build_tx"](blockhash)), opts=entry["opts"]).value)
+        except Exception as e:
+            print(f"❌ 만료 트랜잭션 재전송 실패 ({entry['origin']}): {e}")
+            return
+
+        entry = dict(entry, last_valid=last_valid, resends=entry["resends"] + 1)
+        with self._lock:
+            self._pending[new_sig] = entry
+            self._aliases[entry["origin"]] = (new_sig, time.monotonic())
+        print(f"🔁 blockhash 만료 → 재서명 후 재전송 ({entry['resends']}): {sig} → {new_sig}")
+
+
+_resender = None
+
+
+def get_resender(client) -> ExpiryResender:
+    global _resender
+    cache = get_blockhash_cache(client)
+    with _cache_lock:
+        if _resender is None:
+            _resender = ExpiryResender(client, cache)
+        return _resender
+
+
+def current_signature(sig) -> str:
+    """확정 조회용 — 만료로 재전송된 트랜잭션이면 새 서명"""
+    return _resender.current(sig) if _resender is not None else str(sig)
+
+
+# -------------------------------------------------------------------
+# 🔹 전송 (preflight 에러면 즉시, 아니면 만료 감시 후 재서명 / 재전송)
+# -------------------------------------------------------------------
+def send_with_blockhash_retry(client, build_tx, opts=None):
+    """
+    build_tx(blockhash) → 서명된 트랜잭션
+    preflight 에서 blockhash 만료 에러가 나면 바로 새 blockhash 로 다시 서명해서 전송하고,
+    전송된 트랜잭션은 ExpiryResender 가 확정 또는 만료까지 추적한다.
+    """
+    cache = get_blockhash_cache(client)
+    for attempt in range(BLOCKHASH_SEND_RETRIES + 1):
+        blockhash, last_valid = cache.get()
+        try:
+            resp = client.send_raw_transaction(bytes(build_tx(blockhash)), opts=opts)
+        except Exception as e:
+            if attempt < BLOCKHASH_SEND_RETRIES and is_blockhash_error(e):
+                print(f"🔁 blockhash 만료 → 재서명 후 재전송 ({attempt + 1})")
+                cache.invalidate()
+                continue
+            raise
+        get_resender(client).watch(str(resp.value), build_tx, opts, last_valid)
+        return resp
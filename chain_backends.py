@@ -0,0 +1,72 @@
+import time
+import importlib
+
+# 체인 백엔드 모듈 (web3 / solana / solders / spl / nacl 을 불러오는 무거운 모듈)
+BACKEND_MODULES = ["eth_coin", "eth_okx_dex_API", "sol_coin", "sol_okx_dex_API"]
+
+
+# -------------------------------------------------------------------
+# 🔹 지연 로딩
+# -------------------------------------------------------------------
+def lazy(module_name: str, attr: str):
+    """
+    호출되는 순간(워커 스레드 안)에 모듈을 import 해서 attr 를 실행하는 함수.
+    봇 로그인 전에 web3 / solana 를 불러오지 않기 위해 사용한다.
+    """
+    def call(*args, **kwargs):
+        return getattr(importlib.import_module(module_name), attr)(*args, **kwargs)
+
+    call.__name__ = attr
+    call.__qualname__ = f"{module_name}.{attr}"
+    return call
+
+
+def load_backends() -> dict:
+    """백엔드 모듈 import → 모듈별 소요 시간(초)"""
+    timings = {}
+    for name in BACKEND_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def check_connectivity() -> dict:
+    """RPC 연결 확인 → {"eth": bool, "sol": bool}"""
+    import http_client
+
+    result = {}
+    try:
+        result["eth"] = http_client.get_web3().is_connected()
+    except Exception as e:
+        print(f"❌ Ethereum RPC 연결 확인 실패: {e}")
+        result["eth"] = False
+    try:
+        result["sol"] = http_client.get_solana_client().is_connected()
+    except Exception as e:
+        print(f"❌ Solana RPC 연결 확인 실패: {e}")
+        result["sol"] = False
+    return result
+
+
+def init_backends() -> dict:
+    """로그인 후 백그라운드에서 실행: 모듈 로딩 + 연결 확인 + blockhash 갱신 / wSOL 유지 시작"""
+    start = time.perf_counter()
+    timings = load_backends()
+    connectivity = check_connectivity()
+
+    import http_client
+    from blockhash_cache import get_blockhash_cache
+    get_blockhash_cache(http_client.get_solana_client()).start()
+
+    # wSOL 잔액 유지 (스왑 직전 잔액 확인 / 래핑 없이 바로 전송)
+    from wallet_pool import load_keys
+    if load_keys("SOL_PRIVATE_KEYS", "SOL_PRIVATE_KEY"):
+        from sol_okx_dex_API import get_wsol_maintainer
+        get_wsol_maintainer().start()
+
+    return {
+        "imports": timings,
+        "connectivity": connectivity,
+        "ready_sec": time.perf_counter() - start,
+    }
@@ -0,0 +1,65 @@
+import asyncio
+
+from transfer_executor import transfer_executor
+
+
+# -------------------------------------------------------------------
+# 🔹 클레임 배치 수집기
+# -------------------------------------------------------------------
+class ClaimBatcher:
+    """
+    같은 key(토큰) 에 대한 클레임을 window 동안 모아서 send_batch 로 한 번에 처리한다.
+    send_batch(key, items) 는 items 순서대로 결과(또는 Exception) 리스트를 반환해야 하며,
+    체인 워커 풀(transfer_executor)에서 실행된다.
+    """
+
+    def __init__(self, chain: str, send_batch, window_sec: float = 0.5, max_items: int = 200):
+        self.chain = chain
+        self.send_batch = send_batch
+        self.window_sec = window_sec
+        self.max_items = max_items
+        self._pending = {}   # key → [(item, future), ...]
+        self._tasks = set()
+
+    async def submit(self, key, item):
+        """클레임 1건 등록 → 해당 배치 전송이 끝나면 이 클레임의 결과 반환"""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+
+        bucket = self._pending.get(key)
+        if bucket is None:
+            bucket = self._pending[key] = []
+            loop.call_later(self.window_sec, self._schedule_flush, key, bucket)
+        bucket.append((item, fut))
+
+        # 한도에 도달하면 window 를 기다리지 않고 바로 전송
+        if len(bucket) >= self.max_items:
+            self._schedule_flush(key, bucket)
+
+        return await fut
+
+    def _schedule_flush(self, key, bucket):
+        if self._pending.get(key) is not bucket:
+            return  # 이미 전송된 배치
+        del self._pending[key]
+        task = asyncio.ensure_future(self._flush(key, bucket))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, key, bucket):
+        items = [item for item, _ in bucket]
+        try:
+            results = await transfer_executor.run(self.chain, self.send_batch, key, items)
+        except Exception as e:
+            results = [e] * len(items)
+
+        for (_, fut), result in zip(bucket, results):
+            if fut.done():
+                continue
+            if isinstance(result, Exception):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+    def pending_count(self) -> int:
+        return sum(len(bucket) for bucket in self._pending.values())
@@ -0,0 +1,85 @@
+import time
+import asyncio
+import threading
+
+from storage import store
+
+# 버퍼가 이 개수를 넘거나 FLUSH_INTERVAL_SEC 가 지나면 한 번에 기록
+FLUSH_BATCH_SIZE = 100
+FLUSH_INTERVAL_SEC = 1.0
+
+
+class DuplicateClaim(Exception):
+    """이미 받은 토큰을 다시 요청한 경우"""
+
+
+def normalize_wallet(wallet: str) -> str:
+    # EVM 주소는 대소문자 무관, Solana 주소는 대소문자 구분
+    wallet = wallet.strip()
+    return wallet.lower() if wallet.lower().startswith("0x") else wallet
+
+
+# -------------------------------------------------------------------
+# 🔹 사용자별 클레임 장부
+# -------------------------------------------------------------------
+class ClaimLedger:
+    """
+    (디스코드 유저, 토큰) / (지갑 주소, 토큰) 중복 체크를 메모리 set 으로 처리하고
+    클레임 기록은 버퍼에 모아 SQLite 에 한 번에 추가(append-only)한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_user = set()
+        self._by_wallet = set()
+        self._buffer = []
+        self._flush_handle = None
+        for user_id, wallet, symbol in store.claim_keys():
+            self._by_user.add((user_id, symbol))
+            self._by_wallet.add((wallet, symbol))
+
+    def reserve(self, user_id, wallet: str, symbol: str):
+        """RPC 전에 호출 — 중복이면 DuplicateClaim, 아니면 예약"""
+        user_key = (str(user_id), symbol.lower())
+        wallet_key = (normalize_wallet(wallet), symbol.lower())
+        with self._lock:
+            if user_key in self._by_user:
+                raise DuplicateClaim(f"이미 {symbol.upper()} 를 받으셨습니다.")
+            if wallet_key in self._by_wallet:
+                raise DuplicateClaim(f"이 지갑은 이미 {symbol.upper()} 를 받았습니다.")
+            self._by_user.add(user_key)
+            self._by_wallet.add(wallet_key)
+
+    def release(self, user_id, wallet: str, symbol: str):
+        """전송 실패 → 예약 해제"""
+        with self._lock:
+            self._by_user.discard((str(user_id), symbol.lower()))
+            self._by_wallet.discard((normalize_wallet(wallet), symbol.lower()))
+
+    def record(self, user_id, wallet: str, symbol: str, chain: str, amount: float, tx_hash: str):
+        """전송 성공 → 버퍼에 추가 (이벤트 루프에서 호출)"""
+        row = (str(user_id), normalize_wallet(wallet), symbol.lower(), chain, amount, str(tx_hash), time.time())
+        with self._lock:
+            self._buffer.append(row)
+            size = len(self._buffer)
+
+        if size >= FLUSH_BATCH_SIZE:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(FLUSH_INTERVAL_SEC, self.flush)
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        try:
+            store.insert_claims(rows)
+        except Exception as e:
+            print(f"❌ 클레임 기록 실패 ({len(rows)}건): {e}")
+            with self._lock:
+                self._buffer = rows + self._buffer
+
+
+claim_ledger = ClaimLedger()
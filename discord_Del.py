@@ -1,24 +1,128 @@
 import os
+import time
+import asyncio
+import argparse
 import discord
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 
 load_dotenv()
 
 TOKEN = os.getenv("DISCORD_BOT_TOKEN")
-NOTICE_CHANNEL_ID = int(os.getenv("DISCORD_ADMIN_CHANNEL"))
 
-intents = discord.Intents.default()
-bot = discord.Client(intents=intents)
+# 14일 이내 메시지만 bulk delete 가능 (경계에서 실패하지 않도록 1시간 여유)
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(hours=1)
+BULK_DELETE_BATCH = 100
+SINGLE_DELETE_DELAY_SEC = 1.0   # 오래된 메시지 단건 삭제 간격 (rate limit 대응)
 
-@bot.event
-async def on_ready():
-    print(f"✅ 로그인: {bot.user}")
 
-    channel = bot.get_channel(NOTICE_CHANNEL_ID)
+# -------------------------------------------------------------------
+# 옵션
+# -------------------------------------------------------------------
+def parse_args():
+    parser = argparse.ArgumentParser(description="디스코드 채널 메시지 일괄 삭제")
+    parser.add_argument("--channel", type=int, default=int(os.getenv("DISCORD_ADMIN_CHANNEL", "0")),
+                        help="채널 id (기본: DISCORD_ADMIN_CHANNEL)")
+    parser.add_argument("--limit", type=int, default=100, help="확인할 최근 메시지 수 (0 = 전체)")
+    parser.add_argument("--author", type=int, help="이 유저 id 의 메시지만 삭제")
+    parser.add_argument("--bot-only", action="store_true", help="봇 자신의 메시지만 삭제")
+    parser.add_argument("--older-than", type=float, help="N 시간보다 오래된 메시지만 삭제")
+    parser.add_argument("--newer-than", type=float, help="N 시간 이내 메시지만 삭제")
+    parser.add_argument("--contains", help="이 문자열이 들어간 메시지만 삭제 (예: 메뉴 문구)")
+    parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 개수만 확인")
+    return parser.parse_args()
 
-    # 최근 100개 메시지 가져와서 모두 삭제 (필요 시 제한 늘리기)
-    async for msg in channel.history(limit=100):
-        await msg.delete()
-    print("📢 공지 채널 메시지 삭제 완료!")
 
-bot.run(TOKEN)
\ No newline at end of file
+def build_check(args, bot_user):
+    now = datetime.now(timezone.utc)
+
+    def check(msg: discord.Message) -> bool:
+        if args.author and msg.author.id != args.author:
+            return False
+        if args.bot_only and msg.author != bot_user:
+            return False
+        age = now - msg.created_at
+        if args.older_than is not None and age < timedelta(hours=args.older_than):
+            return False
+        if args.newer_than is not None and age > timedelta(hours=args.newer_than):
+            return False
+        if args.contains and args.contains not in msg.content:
+            return False
+        return True
+
+    return check
+
+
+# -------------------------------------------------------------------
+# 일괄 삭제 (14일 이내 → bulk delete 100개씩, 이전 → 단건 삭제)
+# -------------------------------------------------------------------
+class PurgeProgress:
+    def __init__(self):
+        self.start = time.monotonic()
+        self.deleted = 0
+
+    def add(self, count: int):
+        self.deleted += count
+        elapsed = time.monotonic() - self.start
+        rate = self.deleted / elapsed if elapsed > 0 else 0.0
+        print(f"🧹 {self.deleted}개 삭제 ({rate:.1f}개/초)")
+
+
+async def purge_channel(channel, check, limit: int, dry_run: bool = False) -> int:
+    now = datetime.now(timezone.utc)
+    progress = PurgeProgress()
+    bulk, old = [], []
+
+    async for msg in channel.history(limit=limit or None):
+        if not check(msg):
+            continue
+        if now - msg.created_at < BULK_DELETE_MAX_AGE:
+            bulk.append(msg)
+        else:
+            old.append(msg)
+
+        if len(bulk) == BULK_DELETE_BATCH:
+            if not dry_run:
+                await channel.delete_messages(bulk)
+            progress.add(len(bulk))
+            bulk = []
+
+    if bulk:
+        if not dry_run:
+            await channel.delete_messages(bulk)
+        progress.add(len(bulk))
+
+    # 14일 지난 메시지는 bulk delete 불가 → 간격 두고 하나씩
+    for msg in old:
+        if not dry_run:
+            try:
+                await msg.delete()
+            except discord.NotFound:
+                pass
+            await asyncio.sleep(SINGLE_DELETE_DELAY_SEC)
+        progress.add(1)
+
+    return progress.deleted
+
+
+# -------------------------------------------------------------------
+# 실행
+# -------------------------------------------------------------------
+if __name__ == "__main__":
+    args = parse_args()
+
+    intents = discord.Intents.default()
+    bot = discord.Client(intents=intents)
+
+    @bot.event
+    async def on_ready():
+        print(f"✅ 로그인: {bot.user}")
+        try:
+            channel = bot.get_channel(args.channel) or await bot.fetch_channel(args.channel)
+            deleted = await purge_channel(channel, build_check(args, bot.user), args.limit, args.dry_run)
+            label = "삭제 대상" if args.dry_run else "삭제 완료"
+            print(f"📢 {channel} 메시지 {label}: {deleted}개")
+        finally:
+            await bot.close()
+
+    bot.run(TOKEN)
@@ -1,47 +1,142 @@
-import json, datetime, os, asyncio, discord
+import datetime, os, asyncio, discord
 from discord.ext import commands, tasks
 from discord import ui, ButtonStyle
-from collections import OrderedDict
-from web3 import Web3
 from datetime import datetime, timezone
 
-from eth_coin import get_erc20_decimals, send_erc20
-from sol_coin import get_spl_decimals, send_spl_token
-from eth_okx_dex_API import swap_eth_to_token
-from sol_okx_dex_API import swap_sol_to_token_instruction
 from amount import get_amount_from_tx
-from eth_okx_dex_API import get_amount_from_tx_eth
+from transfer_executor import transfer_executor, TransferQueueFull
+from claim_batcher import ClaimBatcher
+from token_cache import token_cache
+from tx_tracker import ConfirmationTracker, TransactionFailed
+from chain_backends import lazy, init_backends
+from storage import store
+from claim_ledger import claim_ledger, DuplicateClaim
+from validation import validate_claim, InvalidAddress
+from token_index import TokenIndex
+from Notice_Explorers import NoticeCrawler
+import metrics
+from loop_monitor import loop_monitor, profiler, install_signal_handler
+from prewarm import swap_prewarmer, register_buy_amount, ETH_REGISTER_BUY, SOL_REGISTER_BUY
+
+# ✅ 체인 백엔드(web3 / solana)는 처음 쓰일 때 워커 스레드에서 import
+get_erc20_decimals = lazy("eth_coin", "get_erc20_decimals")
+send_erc20 = lazy("eth_coin", "send_erc20")
+send_erc20_batch = lazy("eth_coin", "send_erc20_batch")
+get_block_number = lazy("eth_coin", "get_block_number")
+get_receipt_statuses = lazy("eth_coin", "get_receipt_statuses")
+get_spl_decimals = lazy("sol_coin", "get_spl_decimals")
+get_token_meta = lazy("sol_coin", "get_token_meta")
+send_spl_token = lazy("sol_coin", "send_spl_token")
+send_spl_token_batch = lazy("sol_coin", "send_spl_token_batch")
+get_signature_statuses = lazy("sol_coin", "get_signature_statuses")
+swap_eth_to_token = lazy("eth_okx_dex_API", "swap_eth_to_token")
+get_amount_from_tx_eth = lazy("eth_okx_dex_API", "get_amount_from_tx_eth")
+swap_sol_to_token_instruction = lazy("sol_okx_dex_API", "swap_sol_to_token_instruction")
+
+# 빗썸 공지 확인 주기 (새 공지만 가져오므로 짧게)
+NOTICE_POLL_SEC = int(os.getenv("NOTICE_POLL_SEC", "60"))
+
+# 클레임 배치 수집 시간 (0 이면 배치 없이 1건씩 전송)
+SOL_BATCH_WINDOW_MS = int(os.getenv("SOL_BATCH_WINDOW_MS", "500"))
+ETH_BATCH_WINDOW_MS = int(os.getenv("ETH_BATCH_WINDOW_MS", "2000"))
 
-TOKENS_FILE = "tokens.json"
-NOTICE_FILE = "airdrop_explorers.json"
 
+# -------------------------------------------------------------------
+# 토큰 저장 / 불러오기 (SQLite, 최초 실행 시 tokens.json 에서 마이그레이션)
+# -------------------------------------------------------------------
+TOKENS = store.load_tokens()  # OrderedDict, 최신 등록이 맨 앞
+token_index = TokenIndex(TOKENS)  # 메뉴 페이지 / 검색용 스냅샷
+
+def add_token_first(symbol: str, data: dict):
+    # 새 항목을 맨 앞에 삽입 (O(1)) + 해당 행만 upsert
+    symbol = symbol.lower()
+    TOKENS[symbol] = data
+    TOKENS.move_to_end(symbol, last=False)
+    store.upsert_token(symbol, data)
+    token_index.rebuild(TOKENS)
 
 # -------------------------------------------------------------------
-# 토큰 저장 / 불러오기
+# 토큰 메타데이터 캐시 예열 (전송 시 메타데이터 RPC 0회)
 # -------------------------------------------------------------------
-if os.path.exists(TOKENS_FILE):
-    with open(TOKENS_FILE, "r", encoding="utf-8") as f:
-        TOKENS = json.load(f)
-else:
-    TOKENS = {}
+async def warm_token_cache():
+    for symbol, token in list(TOKENS.items()):
+        chain = token["chain"]
+        if chain not in ("eth", "sol"):
+            continue
+        try:
+            if "decimals" not in token_cache.get(chain, token["address"]):
+                token_cache.update(chain, token["address"], decimals=token["decimals"])
+            if chain == "sol":
+                await transfer_executor.run("sol", get_token_meta, token["address"])
+        except Exception as e:
+            print(f"⚠️ 토큰 캐시 예열 실패 ({symbol}): {e}")
+
+async def start_chain_backends():
+    try:
+        report = await asyncio.to_thread(init_backends)
+        print(
+            f"🔌 체인 백엔드 준비 완료 ({report['ready_sec']:.2f}s) "
+            f"ETH={'✅' if report['connectivity']['eth'] else '❌'} "
+            f"SOL={'✅' if report['connectivity']['sol'] else '❌'}"
+        )
+    except Exception as e:
+        print(f"❌ 체인 백엔드 초기화 실패: {e}")
+    await warm_token_cache()
 
-def save_tokens():
-    # dict 를 OrderedDict 로 정렬해서 저장
-    ordered = OrderedDict(TOKENS)
-    with open(TOKENS_FILE, "w", encoding="utf-8") as f:
-        json.dump(ordered, f, indent=2, ensure_ascii=False)
+# -------------------------------------------------------------------
+# 클레임 배치 전송 (같은 토큰 클레임을 모아 트랜잭션 1개로)
+# -------------------------------------------------------------------
+def send_spl_claims(key, recipients):
+    mint_address, decimals = key
+    return send_spl_token_batch(mint_address, recipients, decimals)
 
-def add_token_first(symbol: str, data: dict):
-    global TOKENS
-    # 새 항목을 맨 앞에 삽입
-    TOKENS = {symbol.lower(): data, **TOKENS}
-    save_tokens()
+def send_erc20_claims(key, recipients):
+    token_address, decimals = key
+    return send_erc20_batch(token_address, recipients, decimals)
+
+sol_batcher = ClaimBatcher("sol", send_spl_claims, window_sec=SOL_BATCH_WINDOW_MS / 1000)
+eth_batcher = ClaimBatcher("eth", send_erc20_claims, window_sec=ETH_BATCH_WINDOW_MS / 1000)
+
+# -------------------------------------------------------------------
+# 트랜잭션 확정 추적 (고정 sleep 대신 확정되는 즉시 등록)
+# -------------------------------------------------------------------
+confirmation_trackers = {
+    "sol": ConfirmationTracker("sol", get_signature_statuses, poll_min=0.4, poll_max=4.0),
+    # ETH 는 새 블록이 나왔을 때만 영수증 조회
+    "eth": ConfirmationTracker("eth", get_receipt_statuses, head_fn=get_block_number, poll_min=2.0, poll_max=12.0),
+}
+
+# 대기열 깊이 (수집 요청이 올 때만 계산)
+metrics.gauge(
+    "claim_batch_pending", "배치 전송을 기다리는 클레임 수",
+    lambda: [({"chain": "sol"}, sol_batcher.pending_count()), ({"chain": "eth"}, eth_batcher.pending_count())],
+)
+metrics.gauge(
+    "confirmations_pending", "확정을 기다리는 트랜잭션 수",
+    lambda: [({"chain": chain}, tracker.pending_count()) for chain, tracker in confirmation_trackers.items()],
+)
 
 # -------------------------------------------------------------------
 # 디스코드 봇 초기화
 # -------------------------------------------------------------------
 intents = discord.Intents.default()
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+class CoinBot(commands.Bot):
+    async def setup_hook(self):
+        # ✅ custom_id 로 디스패치되는 상태 없는 메뉴 버튼 (재시작 후에도 동작)
+        self.add_dynamic_items(
+            MainView.TokenSelect, MainView.PageButton, MainView.SearchButton, MainView.RegisterButton
+        )
+        # ✅ 디스코드 REST 호출 지연 기록
+        metrics.instrument_discord(self)
+        # ✅ 이벤트 루프 지연 / 멈춤 감시 + SIGUSR1 프로파일
+        loop_monitor.start()
+        install_signal_handler()
+
+bot = CoinBot(command_prefix="!", intents=intents)
+
+# 채널 id → (메뉴 메시지, 관리자 메뉴 여부)
+MENU_MESSAGES = {}
 
 # -------------------------------------------------------------------
 # 신규 토큰 등록 버튼 → RegisterModal 연결
@@ -80,27 +175,32 @@ class RegisterModal(discord.ui.Modal, title="코인 등록하기"):
             symbol = self.symbol_input.value
             address = self.address_input.value
 
-            async def delayed_save(symbol, address, decimals, tx_hash, wait_sec, chain):
-                await asyncio.sleep(wait_sec)
-                print(chain, symbol, address, decimals, tx_hash, wait_sec)
+            async def delayed_save(symbol, address, decimals, tx_hash, chain):
+                # ✅ 스왑 트랜잭션이 확정되는 즉시 진행
+                if chain in confirmation_trackers:
+                    try:
+                        await confirmation_trackers[chain].wait(tx_hash)
+                    except TransactionFailed as e:
+                        print(f"❌ {e}")
+                    except asyncio.TimeoutError as e:
+                        print(f"⚠️ {e}")
+                print(chain, symbol, address, decimals, tx_hash)
                 if chain == "eth":
-                    save_amount = get_amount_from_tx_eth(tx_hash, address, decimals)
+                    save_amount = await transfer_executor.run("eth", get_amount_from_tx_eth, tx_hash, address, decimals)
                     add_token_first(symbol.lower(), {
                         "chain": chain,
                         "address": address,
                         "decimals": decimals,
                         "amount": save_amount
                     })
-                    save_tokens()
                 elif chain == "sol":
-                    save_amount = get_amount_from_tx(tx_hash)
+                    save_amount = await transfer_executor.run("sol", get_amount_from_tx, tx_hash)
                     add_token_first(symbol.lower(), {
                         "chain": chain,
                         "address": address,
                         "decimals": decimals,
                         "amount": save_amount
                     })
-                    save_tokens()
                 else:
                     save_amount = 0.0
                     add_token_first(symbol.lower(), {
@@ -109,7 +209,9 @@ class RegisterModal(discord.ui.Modal, title="코인 등록하기"):
                         "decimals": 0,
                         "amount": save_amount
                     })
-                    save_tokens()
+                # ✅ 새 토큰 버튼 반영 (기존 메뉴 메시지 수정)
+                await refresh_menus()
+
                 if chain == "mainnet":
                     final_msg = f"✅ {symbol.upper()} 수동 등록완료"
                 # ✅ 최종 메시지
@@ -120,10 +222,7 @@ class RegisterModal(discord.ui.Modal, title="코인 등록하기"):
 
                 # 공지 메시지 수정
                 try:
-                    with open("notice_messages.json", "r", encoding="utf-8") as f:
-                        notice_map = json.load(f)
-
-                    msg_id = notice_map.get(symbol.lower())
+                    msg_id = store.get_notice_message(symbol.lower())
                     if msg_id:
                         announce_channel = bot.get_channel(int(os.getenv("DISCORD_ANNOUNCE_CHANNEL")))
                         if announce_channel:
@@ -139,11 +238,8 @@ class RegisterModal(discord.ui.Modal, title="코인 등록하기"):
                 admin_channel = bot.get_channel(int(os.getenv("DISCORD_ADMIN_CHANNEL")))
                 if admin_channel:
                     try:
-                        # notice_messages.json에서 msg_id 찾아오기
-                        with open("notice_messages.json", "r", encoding="utf-8") as f:
-                            notice_map = json.load(f)
-
-                        msg_id = notice_map.get(symbol.lower())
+                        # 저장소에서 msg_id 찾아오기
+                        msg_id = store.get_notice_message(symbol.lower())
                         if msg_id:
                             old_msg = await admin_channel.fetch_message(msg_id)
                             new_embed = old_msg.embeds[0]
@@ -157,28 +253,42 @@ class RegisterModal(discord.ui.Modal, title="코인 등록하기"):
                         print(f"❌ 관리자 공지 수정 실패: {e}")
 
             if chain == "eth":
-                decimals = get_erc20_decimals(address)
-                fixed_amount = 0.00025
-                tx_hash = swap_eth_to_token(address, Web3.to_wei(fixed_amount, "ether"))
-                msg = f"✅ {symbol.upper()} 등록 및 {fixed_amount} ETH 매수!\n[Etherscan](https://etherscan.io/tx/{tx_hash})"
+                # 공지 단계에서 준비된 스왑이 있으면 서명 + 전송만
+                prepared = swap_prewarmer.take("eth", address)
+                wei_amount = register_buy_amount("eth")
+                if prepared:
+                    decimals = prepared["decimals"]
+                    tx_hash = await transfer_executor.run(
+                        "eth", swap_eth_to_token, address, wei_amount, prepared_tx=prepared["swap"]
+                    )
+                else:
+                    decimals = await transfer_executor.run("eth", get_erc20_decimals, address)
+                    tx_hash = await transfer_executor.run("eth", swap_eth_to_token, address, wei_amount)
+                msg = f"✅ {symbol.upper()} 등록 및 {ETH_REGISTER_BUY} ETH 매수!\n[Etherscan](https://etherscan.io/tx/{tx_hash})"
                 await interaction.followup.send(msg)
-                asyncio.create_task(delayed_save(symbol, address, decimals, tx_hash, 60, "eth"))
+                asyncio.create_task(delayed_save(symbol, address, decimals, tx_hash, "eth"))
 
             elif chain == "sol":
-                decimals = get_spl_decimals(address)
-                fixed_amount = 0.0025
-                lamports = int(fixed_amount * 10**9)
-                tx_hash = str(swap_sol_to_token_instruction(address, lamports))
-                msg = f"✅ {symbol.upper()} 등록 및 {fixed_amount} SOL 매수!\n[Solscan](https://solscan.io/tx/{tx_hash})"
+                prepared = swap_prewarmer.take("sol", address)
+                lamports = register_buy_amount("sol")
+                if prepared:
+                    decimals = prepared["decimals"]
+                    tx_hash = str(await transfer_executor.run(
+                        "sol", swap_sol_to_token_instruction, address, lamports, prepared=prepared["swap"]
+                    ))
+                else:
+                    decimals = await transfer_executor.run("sol", get_spl_decimals, address)
+                    tx_hash = str(await transfer_executor.run("sol", swap_sol_to_token_instruction, address, lamports))
+                msg = f"✅ {symbol.upper()} 등록 및 {SOL_REGISTER_BUY} SOL 매수!\n[Solscan](https://solscan.io/tx/{tx_hash})"
                 await interaction.followup.send(msg)
-                asyncio.create_task(delayed_save(symbol, address, decimals, tx_hash, 20, "sol"))
+                asyncio.create_task(delayed_save(symbol, address, decimals, tx_hash, "sol"))
 
             elif chain == "mainnet":
                 # 👉 메인넷 코인은 단순 등록 완료 메시지만 전송
                 msg = f"✅ {symbol.upper()} 등록완료"
                 await interaction.followup.send(msg)
-                # 필요하다면 notice_messages.json 수정 위해 delayed_save 호출
-                asyncio.create_task(delayed_save(symbol, address, 0, "", 5, "mainnet"))
+                # 필요하다면 공지 메시지 수정 위해 delayed_save 호출
+                asyncio.create_task(delayed_save(symbol, address, 0, "", "mainnet"))
 
 
             else:
@@ -190,45 +300,49 @@ class RegisterModal(discord.ui.Modal, title="코인 등록하기"):
 
 
 
-    async def refresh_menus(self, interaction: discord.Interaction):
-        """관리자/사용자 채널 메뉴 새로고침"""
-        admin_channel = interaction.client.get_channel(int(os.getenv("DISCORD_ADMIN_CHANNEL")))
-        user_channel = interaction.client.get_channel(int(os.getenv("DISCORD_USER_CHANNEL")))
-
-        if admin_channel:
-            await clear_old_menus(admin_channel)
-            view_admin = MainView(is_admin=True)
-            msg_admin = await admin_channel.send("⚙️ 관리자용 코인 관리 메뉴", view=view_admin)
-            view_admin.menu_message = msg_admin
-
-        if user_channel:
-            await clear_old_menus(user_channel)
-            view_user = MainView(is_admin=False)
-            msg_user = await user_channel.send("📤 코인을 전송하려면 클릭하세요:", view=view_user)
-            view_user.menu_message = msg_user
-
-
-
-
 # -------------------------------------------------------------------
 # 전송용 모달
 # -------------------------------------------------------------------
 class WalletModal(discord.ui.Modal, title="받는 지갑 주소 입력"):
     wallet = discord.ui.TextInput(label="받는 지갑 주소", required=True)
 
-    def __init__(self, token_symbol: str, parent_message: discord.Message, is_admin: bool):
+    def __init__(self, token_symbol: str):
         super().__init__()
         self.token_symbol = token_symbol
-        self.parent_message = parent_message
-        self.is_admin = is_admin
 
     async def on_submit(self, interaction: discord.Interaction):
         token = TOKENS[self.token_symbol]
         amount_value = token["amount"]
 
+        # ✅ 주소 / 수량 검증 (로컬 계산만, 잘못된 체인 주소 · 오타 · PDA 를 큐에 넣기 전에 거절)
+        try:
+            wallet = validate_claim(token, self.wallet.value)
+        except InvalidAddress as e:
+            await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
+            return
+
+        # ✅ 중복 수령 체크 (메모리 인덱스, RPC 전에 처리)
+        try:
+            claim_ledger.reserve(interaction.user.id, wallet, self.token_symbol)
+        except DuplicateClaim as e:
+            await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
+            return
+
+        # ✅ 3초 제한 안에 먼저 응답 → 전송은 체인별 워커 풀에서 처리
+        await interaction.response.defer(thinking=True)
+
+        tx_ref = None
         try:
             if token["chain"] == "eth":
-                tx_hash = send_erc20(token["address"], self.wallet.value, amount_value, token["decimals"])
+                if ETH_BATCH_WINDOW_MS > 0:
+                    tx_hash = await eth_batcher.submit(
+                        (token["address"], token["decimals"]), (wallet, amount_value)
+                    )
+                else:
+                    tx_hash = await transfer_executor.run(
+                        "eth", send_erc20, token["address"], wallet, amount_value, token["decimals"]
+                    )
+                tx_ref = tx_hash
                 result_msg = (
                     f"🤗 {interaction.user.mention}\n"
                     f"  {amount_value} {self.token_symbol.upper()} 전송 완료!\n"
@@ -236,7 +350,15 @@ class WalletModal(discord.ui.Modal, title="받는 지갑 주소 입력"):
                 )
 
             elif token["chain"] == "sol":
-                sig = send_spl_token(token["address"], self.wallet.value, amount_value, token["decimals"])
+                if SOL_BATCH_WINDOW_MS > 0:
+                    sig = await sol_batcher.submit(
+                        (token["address"], token["decimals"]), (wallet, amount_value)
+                    )
+                else:
+                    sig = await transfer_executor.run(
+                        "sol", send_spl_token, token["address"], wallet, amount_value, token["decimals"]
+                    )
+                tx_ref = sig
                 result_msg = (
                     f"🤗 {interaction.user.mention}\n"
                     f"  {amount_value} {self.token_symbol.upper()} 전송 완료!\n"
@@ -245,64 +367,208 @@ class WalletModal(discord.ui.Modal, title="받는 지갑 주소 입력"):
             else:
                 result_msg = "❌ 지원하지 않는 체인입니다."
 
+        except TransferQueueFull as e:
+            result_msg = f"⏳ {str(e)}"
         except Exception as e:
             result_msg = f"❌ 전송 실패: {str(e)}"
 
-        # ✅ 결과 메시지 (공개 메시지)
-        await interaction.response.send_message(result_msg)
-
-        # ✅ 이전 메뉴 삭제
-        try:
-            await self.parent_message.delete()
-        except Exception:
-            pass
+        # ✅ 클레임 장부 기록 (실패 시 예약 해제 → 다시 시도 가능)
+        if tx_ref is not None:
+            claim_ledger.record(
+                interaction.user.id, wallet, self.token_symbol, token["chain"], amount_value, tx_ref
+            )
+        else:
+            claim_ledger.release(interaction.user.id, wallet, self.token_symbol)
 
-        # ✅ 새 메뉴 띄우기
-        channel = interaction.channel
-        view = MainView(is_admin=self.is_admin)
-        msg = await channel.send("📤 코인을 전송하려면 클릭하세요:", view=view)
-        view.menu_message = msg
+        # ✅ 결과 메시지 (공개 메시지) — 메뉴 메시지는 그대로 유지
+        await interaction.followup.send(result_msg)
 
 # -------------------------------------------------------------------
 # 버튼 UI
 # -------------------------------------------------------------------
 class MainView(discord.ui.View):
-    def __init__(self, is_admin=False):
+    """
+    토큰 선택 메뉴 (셀렉트 1개 = 최대 25개, 최신순 페이지 + 검색)
+    토큰 수와 관계없이 한 페이지 분량만 렌더링한다.
+    """
+
+    def __init__(self, is_admin=False, page: int = 0):
         super().__init__(timeout=None)
         self.is_admin = is_admin
-        self.menu_message: discord.Message | None = None
+        self.page = page
+
+        # ✅ 현재 페이지 토큰 셀렉트 (custom_id 에 페이지 포함)
+        symbols = token_index.page(page)
+        if symbols:
+            self.add_item(self.TokenSelect(str(page), symbols))
 
-        # ✅ 토큰마다 버튼 생성
-        for symbol in TOKENS.keys():
-            self.add_item(self.TokenButton(symbol, self))
+        # ✅ 페이지 이동 / 검색
+        if page > 0:
+            self.add_item(self.PageButton("prev", page - 1))
+        if page + 1 < token_index.page_count():
+            self.add_item(self.PageButton("next", page + 1))
+        self.add_item(self.SearchButton())
 
         # ✅ 관리자 전용 버튼
         if self.is_admin:
             self.add_item(self.RegisterButton())
 
-    class TokenButton(discord.ui.Button):
-        def __init__(self, symbol, parent_view):
+    class TokenSelect(discord.ui.DynamicItem[discord.ui.Select], template=r"pick:(?P<key>\d+|search)"):
+        def __init__(self, key: str, symbols: list):
+            super().__init__(
+                discord.ui.Select(
+                    placeholder="📤 전송할 코인을 선택하세요",
+                    custom_id=f"pick:{key}",
+                    options=[
+                        discord.SelectOption(
+                            label=symbol.upper(),
+                            value=symbol,
+                            description=f"{TOKENS[symbol]['chain'].upper()} · {TOKENS[symbol]['amount']}",
+                        )
+                        for symbol in symbols
+                        if symbol in TOKENS
+                    ],
+                    row=0,
+                )
+            )
+
+        @classmethod
+        async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+            # 선택 값만 필요하므로 옵션은 다시 만들지 않음
+            return cls(match["key"], [])
+
+        async def callback(self, interaction: discord.Interaction):
+            symbol = self.item.values[0]
+            if symbol not in TOKENS:
+                await interaction.response.send_message("❌ 등록되지 않은 토큰입니다.", ephemeral=True)
+                return
+            await interaction.response.send_modal(WalletModal(symbol))
+
+    class PageButton(discord.ui.DynamicItem[discord.ui.Button], template=r"page:(?P<direction>prev|next):(?P<page>\d+)"):
+        def __init__(self, direction: str, page: int):
             super().__init__(
-                label=f"📤 {symbol.upper()} 전송",
-                style=discord.ButtonStyle.blurple
+                discord.ui.Button(
+                    label="◀ 이전" if direction == "prev" else "다음 ▶",
+                    style=discord.ButtonStyle.gray,
+                    custom_id=f"page:{direction}:{page}",
+                    row=1,
+                )
             )
-            self.symbol = symbol
-            self.parent_view = parent_view
+            self.page = page
+
+        @classmethod
+        async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+            return cls(match["direction"], int(match["page"]))
 
         async def callback(self, interaction: discord.Interaction):
-            await interaction.response.send_modal(
-                WalletModal(self.symbol, self.parent_view.menu_message, self.parent_view.is_admin)
+            page = min(self.page, token_index.page_count() - 1)
+            view = MainView(is_admin=False, page=page)
+            # 공용 메뉴는 그대로 두고 본인에게만 보이는 메뉴로 페이지 이동
+            if interaction.message is not None and interaction.message.flags.ephemeral:
+                await interaction.response.edit_message(content=f"📄 {page + 1}/{token_index.page_count()} 페이지", view=view)
+            else:
+                await interaction.response.send_message(
+                    f"📄 {page + 1}/{token_index.page_count()} 페이지", view=view, ephemeral=True
+                )
+            view.stop()
+
+    class SearchButton(discord.ui.DynamicItem[discord.ui.Button], template=r"menu:search"):
+        def __init__(self):
+            super().__init__(
+                discord.ui.Button(
+                    label="🔍 코인 검색",
+                    style=discord.ButtonStyle.gray,
+                    custom_id="menu:search",
+                    row=1,
+                )
             )
 
-    class RegisterButton(discord.ui.Button):
+        @classmethod
+        async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+            return cls()
+
+        async def callback(self, interaction: discord.Interaction):
+            await interaction.response.send_modal(TokenSearchModal())
+
+    class RegisterButton(discord.ui.DynamicItem[discord.ui.Button], template=r"menu:register"):
         def __init__(self):
-            super().__init__(label="📥 코인 등록 (관리자 전용)", style=discord.ButtonStyle.green)
+            super().__init__(
+                discord.ui.Button(
+                    label="📥 코인 등록 (관리자 전용)",
+                    style=discord.ButtonStyle.green,
+                    custom_id="menu:register",
+                    row=1,
+                )
+            )
+
+        @classmethod
+        async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+            return cls()
 
         async def callback(self, interaction: discord.Interaction):
             if not interaction.user.guild_permissions.administrator:
                 await interaction.response.send_message("❌ 이 기능은 관리자 전용입니다.", ephemeral=True)
                 return
             await interaction.response.send_modal(RegisterModal())
+
+
+# -------------------------------------------------------------------
+# 코인 검색 모달 (심볼 접두사)
+# -------------------------------------------------------------------
+class TokenSearchModal(discord.ui.Modal, title="코인 검색"):
+    query = discord.ui.TextInput(label="코인 심볼 (앞 글자)", required=True, max_length=20)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        symbols = token_index.search(self.query.value)
+        if not symbols:
+            await interaction.response.send_message(f"❌ '{self.query.value}' 로 시작하는 코인이 없습니다.", ephemeral=True)
+            return
+        view = discord.ui.View(timeout=None)
+        view.add_item(MainView.TokenSelect("search", symbols))
+        await interaction.response.send_message(f"🔍 검색 결과 {len(symbols)}개", view=view, ephemeral=True)
+        view.stop()
+
+
+# -------------------------------------------------------------------
+# 메뉴 메시지 전송 / 갱신
+# -------------------------------------------------------------------
+MENU_TEXT = {
+    True: "⚙️ 관리자용 코인 관리 메뉴",
+    False: "📤 코인을 전송하려면 클릭하세요:",
+}
+
+async def post_menu(channel: discord.TextChannel, is_admin: bool):
+    """저장된 메뉴 메시지가 있으면 수정, 없으면 새로 전송 후 id 저장"""
+    view = MainView(is_admin=is_admin)
+    # 버튼은 custom_id 로 디스패치되므로 View 객체는 보관하지 않음
+    view.stop()
+
+    msg_id = store.get_menu_message(channel.id)
+    if msg_id:
+        try:
+            msg = await channel.get_partial_message(msg_id).edit(content=MENU_TEXT[is_admin], view=view)
+            MENU_MESSAGES[channel.id] = (msg, is_admin)
+            return
+        except discord.NotFound:
+            print(f"⚠️ 저장된 메뉴 메시지 없음 → 새로 전송 ({channel.id})")
+    else:
+        # 기록이 없을 때만 최근 메시지 일부를 확인해서 이전 메뉴 정리
+        await clear_old_menus(channel)
+
+    msg = await channel.send(MENU_TEXT[is_admin], view=view)
+    store.set_menu_message(channel.id, msg.id)
+    MENU_MESSAGES[channel.id] = (msg, is_admin)
+
+async def refresh_menus():
+    """관리자/사용자 채널 메뉴 새로고침 (토큰 목록이 바뀌었을 때 메시지 수정)"""
+    for channel_id, (msg, is_admin) in list(MENU_MESSAGES.items()):
+        try:
+            view = MainView(is_admin=is_admin)
+            await msg.edit(view=view)
+            view.stop()
+        except Exception as e:
+            print(f"❌ 메뉴 갱신 실패 ({channel_id}): {e}")
+
 # -------------------------------------------------------------------
 # 신규 공지 체크 로직 (한 번 실행)
 # -------------------------------------------------------------------
@@ -316,19 +582,11 @@ class DepositView(ui.View):
 
 # 공지 처리 공통 함수
 # -------------------------------------------------------------------
-async def process_notices():
-    if not os.path.exists(NOTICE_FILE):
-        return
-    with open(NOTICE_FILE, "r", encoding="utf-8") as f:
-        notices = json.load(f)
-
+async def process_notices(notices: list):
     announce_channel = bot.get_channel(int(os.getenv("DISCORD_ANNOUNCE_CHANNEL")))
     admin_channel = bot.get_channel(int(os.getenv("DISCORD_ADMIN_CHANNEL")))
 
-    notice_map = {}
-    if os.path.exists("notice_messages.json"):
-        with open("notice_messages.json", "r", encoding="utf-8") as f:
-            notice_map = json.load(f)
+    notice_map = store.notice_messages()
 
     for event in notices:
         for coin in event["coins"]:
@@ -341,6 +599,9 @@ async def process_notices():
                 continue
 
             if chain in ["eth", "sol"]:
+                # 관리자 등록 전에 스왑 준비 (decimals / 토큰 프로그램 / OKX 견적)
+                swap_prewarmer.schedule(chain, coin["contract"])
+
                 # 기존 처리 (컨트랙트 포함, 등록 완료까지 20초~60초)
                 embed = discord.Embed(
                     title=f"🚀 **빗썸 {coin['coin']} 신규 에어드랍** 🚀",
@@ -386,8 +647,7 @@ async def process_notices():
             if announce_channel:
                 msg = await announce_channel.send(embed=embed, view=deposit_view)
                 notice_map[symbol] = msg.id
-                with open("notice_messages.json", "w", encoding="utf-8") as f:
-                    json.dump(notice_map, f, indent=2, ensure_ascii=False)
+                store.set_notice_message(symbol, msg.id)
 
             # 관리자 채널 → 등록 버튼 + 입금 버튼 같이 전송
             if admin_channel:
@@ -402,8 +662,10 @@ async def process_notices():
 # -------------------------------------------------------------------
 # 기존 메뉴 메시지 삭제 함수
 # -------------------------------------------------------------------
-async def clear_old_menus(channel: discord.TextChannel):
-    async for msg in channel.history(limit=None):  # ✅ limit=None → 전부 확인
+MENU_SCAN_LIMIT = int(os.getenv("MENU_SCAN_LIMIT", "50"))
+
+async def clear_old_menus(channel: discord.TextChannel, limit: int = MENU_SCAN_LIMIT):
+    async for msg in channel.history(limit=limit):  # ✅ 최근 limit 개만 확인 (메뉴 id 기록이 없을 때만 사용)
         if msg.author == bot.user and (
             "⚙️ 관리자용 코인 관리 메뉴" in msg.content
             or "📤 코인을 전송하려면 클릭하세요:" in msg.content
@@ -415,6 +677,42 @@ async def clear_old_menus(channel: discord.TextChannel):
                 print(f"❌ 메시지 삭제 실패: {e}")
 
 
+# -------------------------------------------------------------------
+# 전송 워커 현황 (관리자 전용)
+# -------------------------------------------------------------------
+@bot.tree.command(name="transfer_stats", description="체인별 전송 대기열 / 실행 중 작업 수")
+@discord.app_commands.default_permissions(administrator=True)
+async def transfer_stats(interaction: discord.Interaction):
+    lines = [
+        f"**{chain.upper()}** 워커 {s['workers']} · 대기 {s['queued']} · 실행 중 {s['in_flight']}"
+        for chain, s in transfer_executor.stats().items()
+    ]
+    await interaction.response.send_message("📊 전송 현황\n" + "\n".join(lines), ephemeral=True)
+
+
+# -------------------------------------------------------------------
+# 이벤트 루프 프로파일 (관리자 전용)
+# -------------------------------------------------------------------
+@bot.tree.command(name="profile", description="N초 동안 샘플링 프로파일 (flamegraph 용 파일 저장)")
+@discord.app_commands.default_permissions(administrator=True)
+async def profile(interaction: discord.Interaction, seconds: int = 30):
+    loop = asyncio.get_running_loop()
+    stats = loop_monitor.stats()
+
+    def on_done(path):
+        msg = f"🔥 프로파일 저장: `{path}`" if path else "❌ 프로파일 실패 (로그 확인)"
+        asyncio.run_coroutine_threadsafe(interaction.followup.send(msg, ephemeral=True), loop)
+
+    if not profiler.start(seconds, on_done=on_done):
+        await interaction.response.send_message("⚠️ 이미 프로파일 중입니다.", ephemeral=True)
+        return
+    await interaction.response.send_message(
+        f"⏱️ {seconds}초 프로파일 시작\n"
+        f"루프 최대 지연 {stats['max_lag'] * 1000:.0f}ms · 멈춤 {stats['blocked_count']}회",
+        ephemeral=True,
+    )
+
+
 # -------------------------------------------------------------------
 # 봇 실행
 # -------------------------------------------------------------------
@@ -423,10 +721,10 @@ async def on_ready():
     await bot.tree.sync()
     print(f"✅ 로그인 완료: {bot.user}")
 
-    # 초기 메뉴 + 공지 실행
-    await process_notices()
+    # 체인 백엔드 로딩 / RPC 연결 확인 / 캐시 예열 (백그라운드)
+    asyncio.create_task(start_chain_backends())
 
-    # ✅ 루프 시작은 여기서만
+    # ✅ 공지 크롤링 루프 시작은 여기서만 (첫 실행은 바로)
     if not check_new_notices.is_running():
         check_new_notices.start()
 
@@ -435,25 +733,39 @@ async def on_ready():
     user_channel = bot.get_channel(int(os.getenv("DISCORD_USER_CHANNEL")))
 
     if admin_channel:
-        await clear_old_menus(admin_channel)
-        view = MainView(is_admin=True)
-        msg = await admin_channel.send("⚙️ 관리자용 코인 관리 메뉴", view=view)
-        view.menu_message = msg
-        print("📨 관리자 채널에 새 메뉴 전송 완료")
+        await post_menu(admin_channel, is_admin=True)
+        print("📨 관리자 채널 메뉴 준비 완료")
 
     if user_channel:
-        await clear_old_menus(user_channel)
-        view = MainView(is_admin=False)
-        msg = await user_channel.send("📤 코인을 전송하려면 클릭하세요:", view=view)
-        view.menu_message = msg
-        print("📨 사용자 채널에 새 메뉴 전송 완료")
+        await post_menu(user_channel, is_admin=False)
+        print("📨 사용자 채널 메뉴 준비 완료")
+
 
 
 
+# -------------------------------------------------------------------
+# 빗썸 공지 크롤러 (마지막으로 본 공지 id 이후만, 파일 거치지 않고 바로 처리)
+# -------------------------------------------------------------------
+def load_last_notice_id():
+    value = store.get_meta("last_notice_id")
+    return int(value) if value else None
+
+def save_last_notice_id(notice_id: int):
+    store.set_meta("last_notice_id", notice_id)
 
-@tasks.loop(minutes=10)
+notice_crawler = NoticeCrawler(load_last_notice_id, save_last_notice_id)
+
+
+@tasks.loop(seconds=NOTICE_POLL_SEC)
 async def check_new_notices():
-    await process_notices()
+    try:
+        events = await notice_crawler.poll()
+    except Exception as e:
+        print(f"❌ 공지 크롤링 실패: {e}")
+        return
+    if events:
+        print(f"🆕 새 에어드랍 공지 {len(events)}건")
+        await process_notices(events)
 
 
 @check_new_notices.before_loop
@@ -465,4 +777,10 @@ if __name__ == "__main__":
     TOKEN = os.getenv("DISCORD_BOT_TOKEN")
     if not TOKEN:
         raise RuntimeError("❌ DISCORD_BOT_TOKEN 환경 변수가 필요합니다.")
-    bot.run(TOKEN)
\ No newline at end of file
+    metrics.start_server()
+    try:
+        bot.run(TOKEN)
+    finally:
+        # 버퍼에 남은 클레임 기록 저장
+        claim_ledger.flush()
+        metrics.dump()
\ No newline at end of file
@@ -1,20 +1,31 @@
 import os
+import threading
 from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from eth_account import Account
 from dotenv import load_dotenv
 
+import http_client
+from nonce_manager import get_nonce_manager
+from token_cache import token_cache
+from wallet_pool import WalletPool, HotWallet, load_keys
+
 load_dotenv()
 
 # -------------------------------------------------------------------
 # ⚙️ 환경 변수
 # -------------------------------------------------------------------
 INFURA_URL = os.getenv("INFURA_URL")         # Infura / Alchemy RPC URL
-ETH_PRIVATE_KEY = os.getenv("ETH_PRIVATE_KEY")
-MY_ADDRESS = os.getenv("ETH_ADDRESS")
+# 핫월렛 개인키 목록 (ETH_PRIVATE_KEYS=키1,키2,... / 없으면 ETH_PRIVATE_KEY 하나)
+ETH_PRIVATE_KEYS = load_keys("ETH_PRIVATE_KEYS", "ETH_PRIVATE_KEY")
+
+# Disperse 컨트랙트 (disperse.app 메인넷 배포 주소, 로컬 EVM 테스트 시 env 로 교체)
+DISPERSE_ADDRESS = os.getenv("DISPERSE_ADDRESS", "0xD152f549545093347A162Dce210e7293f1452150")
+ETH_BATCH_MAX_RECIPIENTS = int(os.getenv("ETH_BATCH_MAX_RECIPIENTS", "100"))
+MAX_UINT256 = 2**256 - 1
 
-# Web3 연결
-w3 = Web3(Web3.HTTPProvider(INFURA_URL))
-if not w3.is_connected():
-    raise ConnectionError("❌ Ethereum RPC 연결 실패. INFURA_URL 확인 필요")
+# Web3 연결 (http_client 의 공유 인스턴스, 연결 확인은 봇 로그인 후 백그라운드에서)
+w3 = http_client.get_web3()
 
 
 # -------------------------------------------------------------------
@@ -33,6 +44,53 @@ ERC20_ABI = [
     }
 ]
 
+ERC20_ABI_ALLOWANCE = [
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_owner", "type": "address"},
+            {"name": "_spender", "type": "address"}
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_spender", "type": "address"},
+            {"name": "_value", "type": "uint256"}
+        ],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function",
+    },
+]
+
+DISPERSE_ABI = [
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "token", "type": "address"},
+            {"name": "recipients", "type": "address[]"},
+            {"name": "values", "type": "uint256[]"}
+        ],
+        "name": "disperseToken",
+        "outputs": [],
+        "type": "function",
+    }
+]
+
+ERC20_ABI_BALANCE = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function",
+    }
+]
+
 ERC20_ABI_DECIMALS = [
     {
         "constant": True,
@@ -48,47 +106,206 @@ ERC20_ABI_DECIMALS = [
 # 🔹 ERC20 decimals 조회
 # -------------------------------------------------------------------
 def get_erc20_decimals(token_address: str) -> int:
+    cached = token_cache.get("eth", token_address)
+    if "decimals" in cached:
+        return cached["decimals"]
+
     token = w3.eth.contract(
         address=Web3.to_checksum_address(token_address),
         abi=ERC20_ABI_DECIMALS
     )
-    return token.functions.decimals().call()
+    decimals = token.functions.decimals().call()
+    token_cache.update("eth", token_address, decimals=decimals)
+    return decimals
+
+
+# -------------------------------------------------------------------
+# 🔹 핫월렛 풀 (지갑마다 nonce 관리자가 따로 → 지갑 수만큼 병렬 전송)
+# -------------------------------------------------------------------
+def erc20_balance(wallet: HotWallet, token_address: str) -> int:
+    token = w3.eth.contract(address=Web3.to_checksum_address(token_address), abi=ERC20_ABI_BALANCE)
+    return token.functions.balanceOf(wallet.address).call()
+
+
+eth_wallets = WalletPool(
+    "eth", [HotWallet(Account.from_key(key).address, key) for key in ETH_PRIVATE_KEYS], erc20_balance
+)
+
+
+# -------------------------------------------------------------------
+# 🔹 서명 + 전송 (nonce 관리자 사용)
+# -------------------------------------------------------------------
+def send_signed(tx: dict, wallet: HotWallet = None) -> str:
+    """nonce 발급 → 서명 → 전송 (실패 시 nonce 반납)"""
+    wallet = wallet or eth_wallets.primary
+    nonce_manager = get_nonce_manager(w3, wallet.address)
+    nonce = nonce_manager.allocate()
+    try:
+        tx["nonce"] = nonce
+        signed_tx = w3.eth.account.sign_transaction(tx, wallet.signer)
+        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    except Exception as e:
+        nonce_manager.release(nonce, e)
+        raise
+    nonce_manager.mark_sent(nonce)
+    return w3.to_hex(tx_hash)
 
 
 # -------------------------------------------------------------------
 # 🔹 ERC20 전송
 # -------------------------------------------------------------------
-def send_erc20(token_address: str, to_address: str, amount: float, decimals: int):
+def send_erc20(token_address: str, to_address: str, amount: float, decimals: int, wallet: HotWallet = None):
     """
     ERC20 토큰 전송 함수
     token_address: ERC20 컨트랙트 주소
     to_address: 받는 사람 주소
     amount: 전송 수량 (소수점 단위 입력)
     decimals: 토큰 소수점 자리수 (예: USDT=6, 대부분 ERC20=18)
+    wallet: 보내는 핫월렛 (없으면 잔액이 충분하고 가장 한가한 지갑)
     """
 
     token = w3.eth.contract(
         address=Web3.to_checksum_address(token_address),
         abi=ERC20_ABI
     )
+    value = int(amount * (10 ** decimals))
 
-    nonce = w3.eth.get_transaction_count(MY_ADDRESS)
-    gas_price = w3.eth.gas_price  # ✅ 현재 네트워크 가스비 조회
+    with eth_wallets.use(token_address.lower(), value, wallet) as sender:
+        gas_price = w3.eth.gas_price  # ✅ 현재 네트워크 가스비 조회
 
-    tx = token.functions.transfer(
-        Web3.to_checksum_address(to_address),
-        int(amount * (10 ** decimals))
-    ).build_transaction({
-        "from": MY_ADDRESS,
-        "nonce": nonce,
-        "gas": 100000,   # ERC20 전송 기본 예상치
-        "gasPrice": gas_price,  # ✅ 동적 가스비 적용
-    })
+        tx = token.functions.transfer(
+            Web3.to_checksum_address(to_address),
+            value
+        ).build_transaction({
+            "from": sender.address,
+            "nonce": 0,      # send_signed 에서 nonce 관리자 값으로 교체
+            "gas": 100000,   # ERC20 전송 기본 예상치
+            "gasPrice": gas_price,  # ✅ 동적 가스비 적용
+        })
 
-    signed_tx = w3.eth.account.sign_transaction(tx, ETH_PRIVATE_KEY)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        # ✅ 메모리에서 nonce 발급 (동시 전송 가능)
+        return send_signed(tx, sender)
 
-    return w3.to_hex(tx_hash)
+
+# -------------------------------------------------------------------
+# 🔹 ERC20 배치 전송 (Disperse 컨트랙트 disperseToken 1회 호출)
+# -------------------------------------------------------------------
+# 무제한(MAX_UINT256 승인)으로 확인된 (지갑, 토큰) — 유한한 allowance 는 쓰다 보면 줄어드므로 매번 확인
+_approved_tokens = set()
+_approve_locks = {}
+_approve_locks_guard = threading.Lock()
+UNLIMITED_ALLOWANCE = MAX_UINT256 // 2   # 무제한 승인도 일부 토큰은 사용할 때마다 차감됨
+
+
+def _approve_lock(key) -> threading.Lock:
+    with _approve_locks_guard:
+        return _approve_locks.setdefault(key, threading.Lock())
+
+
+def ensure_disperse_allowance(token_address: str, total: int, wallet: HotWallet = None):
+    """Disperse 컨트랙트에 토큰 사용 승인 (부족할 때만 MAX 승인, 승인 트랜잭션 확정까지 대기)"""
+    wallet = wallet or eth_wallets.primary
+    token_address = Web3.to_checksum_address(token_address)
+    key = (wallet.address, token_address)
+    if key in _approved_tokens:
+        return
+
+    # 같은 지갑 · 토큰의 배치가 동시에 approve 를 두 번 보내지 않도록
+    with _approve_lock(key):
+        if key in _approved_tokens:
+            return
+
+        token = w3.eth.contract(address=token_address, abi=ERC20_ABI_ALLOWANCE)
+        spender = Web3.to_checksum_address(DISPERSE_ADDRESS)
+        allowance = token.functions.allowance(wallet.address, spender).call()
+
+        if allowance < total:
+            tx = token.functions.approve(spender, MAX_UINT256).build_transaction({
+                "from": wallet.address,
+                "nonce": 0,  # send_signed 에서 교체
+                "gasPrice": w3.eth.gas_price,
+            })
+            tx_hash = send_signed(tx, wallet)
+            print(f"🔓 Disperse 승인 전송: {wallet.address} / {token_address} → {tx_hash}")
+            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=180)
+            if receipt["status"] != 1:
+                # 실패한 승인은 기록하지 않음 → 다음 배치에서 allowance 확인부터 다시
+                raise Exception(f"❌ Disperse 승인 실패 (revert): {wallet.address} / {token_address} → {tx_hash}")
+            allowance = MAX_UINT256
+
+        # 유한한 allowance 는 기록하지 않음 → 다음 배치에서 다시 확인 (다 쓰면 재승인)
+        if allowance >= UNLIMITED_ALLOWANCE:
+            _approved_tokens.add(key)
+
+
+def send_erc20_batch(token_address: str, recipients: list, decimals: int, wallet: HotWallet = None) -> list:
+    """
+    recipients: [(to_address, amount), ...]
+    반환: 수신자 순서대로 트랜잭션 해시 또는 Exception
+    wallet: 보내는 핫월렛 (없으면 묶음마다 잔액이 충분하고 가장 한가한 지갑)
+    """
+    results = [None] * len(recipients)
+    entries = []  # (index, checksum 주소, raw 수량)
+    for i, (to_address, amount) in enumerate(recipients):
+        try:
+            entries.append((i, Web3.to_checksum_address(to_address), int(amount * (10 ** decimals))))
+        except Exception as e:
+            results[i] = ValueError(f"잘못된 지갑 주소: {to_address} ({e})")
+
+    if not entries:
+        return results
+
+    disperse = w3.eth.contract(address=Web3.to_checksum_address(DISPERSE_ADDRESS), abi=DISPERSE_ABI)
+    token = Web3.to_checksum_address(token_address)
+
+    for start in range(0, len(entries), ETH_BATCH_MAX_RECIPIENTS):
+        chunk = entries[start:start + ETH_BATCH_MAX_RECIPIENTS]
+        total = sum(value for _, _, value in chunk)
+        try:
+            with eth_wallets.use(token_address.lower(), total, wallet) as sender:
+                ensure_disperse_allowance(token_address, total, sender)
+                call = disperse.functions.disperseToken(
+                    token,
+                    [addr for _, addr, _ in chunk],
+                    [value for _, _, value in chunk],
+                )
+                gas = call.estimate_gas({"from": sender.address})
+                tx = call.build_transaction({
+                    "from": sender.address,
+                    "nonce": 0,  # send_signed 에서 교체
+                    "gas": int(gas * 1.2),
+                    "gasPrice": w3.eth.gas_price,
+                })
+                tx_hash = send_signed(tx, sender)
+            # 수신자별 정산 기록
+            for i, addr, value in chunk:
+                results[i] = tx_hash
+                print(f"📦 ERC20 배치 전송: {sender.address} → {addr} ← {value / (10 ** decimals)} ({tx_hash})")
+        except Exception as e:
+            for i, _, _ in chunk:
+                results[i] = e
+
+    return results
+
+
+# -------------------------------------------------------------------
+# 🔹 영수증 상태 조회 (확정 추적용)
+# -------------------------------------------------------------------
+def get_block_number() -> int:
+    return w3.eth.block_number
+
+
+def get_receipt_statuses(tx_hashes: list) -> dict:
+    """{tx_hash: "confirmed" | "failed" | None(아직 블록에 없음)}"""
+    result = {}
+    for tx_hash in tx_hashes:
+        try:
+            receipt = w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            result[tx_hash] = None
+            continue
+        result[tx_hash] = "confirmed" if receipt["status"] == 1 else "failed"
+    return result
 
 
 # -------------------------------------------------------------------
@@ -1,13 +1,15 @@
 import os
 import hmac
 import base64
-import requests
 import json
 import datetime
 import urllib.parse
 from web3 import Web3
 from dotenv import load_dotenv
 
+import http_client
+from eth_coin import eth_wallets, send_signed
+
 load_dotenv()
 
 # -------------------------------------------------------------------
@@ -19,14 +21,13 @@ OKX_API_PASSPHRASE = os.getenv("OKX_API_PASSPHRASE")
 OKX_PROJECT_ID = os.getenv("OKX_PROJECT_ID")
 
 INFURA_URL = os.getenv("INFURA_URL")  # Ethereum RPC
-ETH_PRIVATE_KEY = os.getenv("ETH_PRIVATE_KEY")
-ETH_ADDRESS = os.getenv("ETH_ADDRESS")
+# 스왑 지갑 = eth_coin 핫월렛 풀의 기본(첫 번째) 지갑 (ETH_PRIVATE_KEYS / ETH_PRIVATE_KEY)
 
-BASE_URL = "https://www.okx.com"   # ✅ OKX DEX 엔드포인트
+BASE_URL = os.getenv("OKX_BASE_URL", "https://www.okx.com")   # ✅ OKX DEX 엔드포인트
 CHAIN_INDEX = "1"  # Ethereum Mainnet
 ETH_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"  # Native ETH
 
-w3 = Web3(Web3.HTTPProvider(INFURA_URL))
+w3 = http_client.get_web3()
 
 
 # -------------------------------------------------------------------
@@ -88,12 +89,12 @@ def get_eth_amount_for_usd(to_token_address: str, usd_amount: float):
         "toTokenAddress": to_token_address,
         "amount": str(10**15),  # 0.001 ETH (테스트용)
         "slippagePercent": "0.5",
-        "userWalletAddress": ETH_ADDRESS,
+        "userWalletAddress": eth_wallets.primary.address,
     }
 
     url = BASE_URL + path
     headers = get_headers("GET", path, params=params)
-    resp = requests.get(url, headers=headers, params=params)
+    resp = http_client.get(url, headers=headers, params=params)
     data = resp.json()
 
     if data.get("code") != "0":
@@ -113,7 +114,8 @@ def get_eth_amount_for_usd(to_token_address: str, usd_amount: float):
 # -------------------------------------------------------------------
 # 스왑 실행
 # -------------------------------------------------------------------
-def swap_eth_to_token(to_token_address: str, wei_amount: int, slippage="0.5") -> str:
+def fetch_eth_swap_tx(to_token_address: str, wei_amount: int, slippage="0.5") -> dict:
+    """OKX 스왑 트랜잭션 데이터 (서명 전) — 사전 준비(prewarm)에서도 사용"""
     path = "/api/v6/dex/aggregator/swap"
     params = {
         "chainIndex": CHAIN_INDEX,  # Ethereum
@@ -121,20 +123,24 @@ def swap_eth_to_token(to_token_address: str, wei_amount: int, slippage="0.5") ->
         "toTokenAddress": to_token_address,
         "amount": str(wei_amount),   # ✅ wei 단위 그대로 전달
         "slippagePercent": slippage,
-        "userWalletAddress": ETH_ADDRESS,
+        "userWalletAddress": eth_wallets.primary.address,
     }
 
     headers = get_headers("GET", path, params=params)
-    resp = requests.get(BASE_URL + path, headers=headers, params=params).json()
+    resp = http_client.get(BASE_URL + path, headers=headers, params=params).json()
     print("DEBUG SWAP Response:", resp)
 
     if resp.get("code") != "0" or not resp.get("data"):
         raise Exception(f"Swap API error: {resp}")
 
-    tx = resp["data"][0]["tx"]
+    return resp["data"][0]["tx"]
+
 
-    # Web3 트랜잭션 생성
-    nonce = w3.eth.get_transaction_count(ETH_ADDRESS)
+def swap_eth_to_token(to_token_address: str, wei_amount: int, slippage="0.5", prepared_tx: dict = None) -> str:
+    # 미리 받아둔 스왑 데이터가 있으면 OKX 요청 없이 서명 + 전송만
+    tx = prepared_tx or fetch_eth_swap_tx(to_token_address, wei_amount, slippage)
+
+    # Web3 트랜잭션 생성 (기본 지갑으로 서명, nonce 는 eth_coin 과 같은 관리자에서 발급)
     tx_obj = {
         "from": tx["from"],
         "to": tx["to"],
@@ -142,14 +148,10 @@ def swap_eth_to_token(to_token_address: str, wei_amount: int, slippage="0.5") ->
         "value": int(tx["value"]),
         "gas": int(tx["gas"]),
         "gasPrice": int(tx["gasPrice"]),
-        "nonce": nonce,
+        "nonce": 0,  # send_signed 에서 교체
         "chainId": w3.eth.chain_id,
     }
-
-    # 서명 + 전송
-    signed_tx = w3.eth.account.sign_transaction(tx_obj, ETH_PRIVATE_KEY)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-    return w3.to_hex(tx_hash)
+    return send_signed(tx_obj, eth_wallets.primary)
 
 
 # -------------------------------------------------------------------
@@ -0,0 +1,182 @@
+import os
+import re
+import time
+import random
+import functools
+import threading
+import requests
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+import metrics
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+HTTP_TIMEOUT_SEC = float(os.getenv("HTTP_TIMEOUT_SEC", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_BACKOFF_SEC = float(os.getenv("HTTP_BACKOFF_SEC", "0.3"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))      # 호스트당 keep-alive 연결 수
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "0") == "1"       # httpx[http2] 설치 시 사용
+
+INFURA_URL = os.getenv("INFURA_URL")
+SOL_RPC_URL = os.getenv("RPC_URL") or "https://api.mainnet-beta.solana.com"
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+# -------------------------------------------------------------------
+# 🔹 호출 지표 (호스트 + JSON-RPC 메서드 / 경로)
+# -------------------------------------------------------------------
+def request_op(url: str, body=None) -> str:
+    """JSON-RPC 면 메서드 이름, 아니면 숫자를 :id 로 바꾼 경로 (라벨 수 제한)"""
+    return metrics.jsonrpc_method(body) or re.sub(r"\d+", ":id", urlsplit(url).path or "/")
+
+
+def timed_send(send, request, *args, **kwargs):
+    """adapter.send 호출 지연 기록, 예외 / 429 / 5xx 는 에러 카운트"""
+    target = urlsplit(request.url).hostname or "?"
+    op = request_op(request.url, request.body)
+    start = time.perf_counter()
+    try:
+        resp = send(request, *args, **kwargs)
+    except Exception:
+        metrics.OUTBOUND_ERRORS.inc(target=target, op=op)
+        raise
+    finally:
+        metrics.OUTBOUND_SECONDS.observe(time.perf_counter() - start, target=target, op=op)
+    if resp.status_code in RETRY_STATUS:
+        metrics.OUTBOUND_ERRORS.inc(target=target, op=op)
+    return resp
+
+
+class TimedAdapter(HTTPAdapter):
+    """요청마다 지연 기록하는 keep-alive 풀 어댑터"""
+
+    def send(self, request, *args, **kwargs):
+        return timed_send(super().send, request, *args, **kwargs)
+
+
+# -------------------------------------------------------------------
+# 🔹 커넥션 풀 세션
+# -------------------------------------------------------------------
+def mount_pool(session: requests.Session) -> requests.Session:
+    """requests 세션에 호스트별 keep-alive 풀 어댑터 장착"""
+    adapter = TimedAdapter(pool_connections=16, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def instrument_session(session: requests.Session) -> requests.Session:
+    """
+    이미 장착된 어댑터는 그대로 두고 send 만 감싸서 지연 기록
+    (cloudscraper 의 CipherSuiteAdapter — TLS 암호 / 지문 설정을 유지해야 Cloudflare 통과)
+    """
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        if getattr(adapter, "_timed", False):
+            continue
+        adapter.send = functools.partial(timed_send, adapter.send)
+        adapter._timed = True
+    return session
+
+
+_lock = threading.Lock()
+_session = None
+_retry_errors = (requests.ConnectionError, requests.Timeout)
+
+
+def get_session():
+    """모듈 전체가 공유하는 HTTP 세션 (HTTP2_ENABLED=1 이고 httpx 가 있으면 HTTP/2)"""
+    global _session, _retry_errors
+    with _lock:
+        if _session is not None:
+            return _session
+        if HTTP2_ENABLED:
+            try:
+                import httpx
+                _session = httpx.Client(
+                    http2=True,
+                    timeout=HTTP_TIMEOUT_SEC,
+                    limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE),
+                )
+                _retry_errors = (httpx.TransportError,)
+                return _session
+            except ImportError:
+                print("⚠️ httpx[http2] 미설치 → HTTP/1.1 세션 사용")
+        _session = mount_pool(requests.Session())
+        return _session
+
+
+def backoff_delay(attempt: int) -> float:
+    """지수 backoff + full jitter"""
+    return random.uniform(0, HTTP_BACKOFF_SEC * (2 ** attempt))
+
+
+def request(method: str, url: str, retries: int = HTTP_RETRIES, session=None, **kwargs):
+    """타임아웃 + 연결 에러 / 429 / 5xx 재시도"""
+    kwargs.setdefault("timeout", HTTP_TIMEOUT_SEC)
+    session = session or get_session()
+    retry_errors = _retry_errors if session is _session else (requests.ConnectionError, requests.Timeout)
+
+    # requests 세션은 TimedAdapter 가 기록, httpx(HTTP/2) 세션은 여기서 기록
+    timed = None
+    if not isinstance(session, requests.Session):
+        payload = kwargs.get("json")
+        op = payload["method"] if isinstance(payload, dict) and "method" in payload else request_op(url, kwargs.get("data"))
+        timed = (urlsplit(url).hostname or "?", op)
+
+    for attempt in range(retries + 1):
+        try:
+            with metrics.timed(*timed) if timed else nullcontext():
+                resp = session.request(method, url, **kwargs)
+            if resp.status_code not in RETRY_STATUS or attempt == retries:
+                return resp
+        except retry_errors:
+            if attempt == retries:
+                raise
+        time.sleep(backoff_delay(attempt))
+
+
+def get(url: str, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+# -------------------------------------------------------------------
+# 🔹 체인 RPC 클라이언트 (엔드포인트당 인스턴스 1개 공유)
+# -------------------------------------------------------------------
+_web3 = None
+_solana_client = None
+
+
+def get_web3():
+    global _web3
+    with _lock:
+        if _web3 is None:
+            from web3 import Web3
+            _web3 = Web3(Web3.HTTPProvider(
+                INFURA_URL,
+                request_kwargs={"timeout": HTTP_TIMEOUT_SEC},
+                session=mount_pool(requests.Session()),
+            ))
+        return _web3
+
+
+def get_solana_client():
+    global _solana_client
+    with _lock:
+        if _solana_client is None:
+            from solana.rpc.api import Client
+            # solana Client 는 httpx 를 쓰므로 메서드 단위로 지연 기록
+            _solana_client = metrics.TimedClient(
+                Client(SOL_RPC_URL, timeout=HTTP_TIMEOUT_SEC), urlsplit(SOL_RPC_URL).hostname or "solana"
+            )
+        return _solana_client
@@ -0,0 +1,59 @@
+import os
+import time
+import threading
+from dotenv import load_dotenv
+
+from solders.pubkey import Pubkey
+from solders.address_lookup_table_account import AddressLookupTable, AddressLookupTableAccount
+
+load_dotenv()
+
+# OKX 라우팅 ALT 는 거의 바뀌지 않으므로 오래 캐시 (주소가 추가돼도 기존 인덱스는 유지됨)
+ALT_CACHE_TTL_SEC = float(os.getenv("ALT_CACHE_TTL_SEC", "600"))
+
+
+# -------------------------------------------------------------------
+# 🔹 Address Lookup Table 캐시
+# -------------------------------------------------------------------
+class LookupTableCache:
+    """ALT 주소 → AddressLookupTableAccount (없는 것만 get_multiple_accounts 1회로 조회)"""
+
+    def __init__(self, client, ttl: float = ALT_CACHE_TTL_SEC):
+        self.client = client
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tables = {}   # 주소(str) → (조회 시각, AddressLookupTableAccount)
+
+    def get_many(self, addresses: list) -> list:
+        now = time.monotonic()
+        with self._lock:
+            missing = [
+                a for a in dict.fromkeys(addresses)
+                if a not in self._tables or now - self._tables[a][0] > self.ttl
+            ]
+
+        if missing:
+            keys = [Pubkey.from_string(a) for a in missing]
+            infos = self.client.get_multiple_accounts(keys).value
+            with self._lock:
+                for address, key, info in zip(missing, keys, infos):
+                    if info is None:
+                        print(f"⚠️ ALT 계정 없음: {address}")
+                        continue
+                    table = AddressLookupTable.deserialize(bytes(info.data))
+                    self._tables[address] = (now, AddressLookupTableAccount(key=key, addresses=list(table.addresses)))
+
+        with self._lock:
+            return [self._tables[a][1] for a in dict.fromkeys(addresses) if a in self._tables]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_lookup_table_cache(client) -> LookupTableCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LookupTableCache(client)
+        return _cache
@@ -0,0 +1,201 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from collections import Counter
+from dotenv import load_dotenv
+
+import metrics
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+LOOP_LAG_INTERVAL_SEC = float(os.getenv("LOOP_LAG_INTERVAL_SEC", "0.25"))
+LOOP_BLOCK_THRESHOLD_SEC = float(os.getenv("LOOP_BLOCK_THRESHOLD_SEC", "0.5"))   # 이보다 오래 멈추면 스택 기록
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_SEC = float(os.getenv("PROFILE_SAMPLE_SEC", "0.005"))              # 샘플링 간격 (200Hz)
+PROFILE_DEFAULT_SEC = float(os.getenv("PROFILE_DEFAULT_SEC", "30"))
+PROFILE_MAX_SEC = 300
+
+LOOP_LAG_SECONDS = metrics.histogram(
+    "event_loop_lag_seconds", "예정 시각 대비 실제 실행 지연",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_BLOCKED = metrics.counter("event_loop_blocked_total", "LOOP_BLOCK_THRESHOLD_SEC 이상 멈춘 횟수")
+
+
+def format_frame(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def folded_stack(frame) -> list:
+    """가장 바깥 → 안쪽 순서의 프레임 이름 목록"""
+    names = []
+    while frame is not None:
+        names.append(format_frame(frame))
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+# -------------------------------------------------------------------
+# 🔹 이벤트 루프 지연 / 멈춤 감시
+# -------------------------------------------------------------------
+class LoopMonitor:
+    """
+    - 루프 안 task: LOOP_LAG_INTERVAL_SEC 마다 깨어나서 예정보다 늦은 만큼을 기록
+    - 감시 스레드: 루프가 LOOP_BLOCK_THRESHOLD_SEC 넘게 응답이 없으면
+      그 순간 루프 스레드의 스택을 sys._current_frames() 로 잡아서 출력 (멈춘 콜백 추적)
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SEC, threshold: float = LOOP_BLOCK_THRESHOLD_SEC):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_lag = 0.0
+        self.blocked_count = 0
+        self.last_block = None       # {"at", "duration", "stack"}
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+
+    def start(self):
+        """이벤트 루프 안에서 호출"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.create_task(self._measure())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def _measure(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled)
+            self._heartbeat = time.monotonic()
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+
+    def _watch(self):
+        blocked_since = None
+        while True:
+            time.sleep(self.interval / 2)
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold:
+                if blocked_since is not None:
+                    duration = time.monotonic() - blocked_since
+                    self.last_block["duration"] = duration
+                    print(f"🐢 이벤트 루프 멈춤 해제 ({duration:.2f}s)")
+                    blocked_since = None
+                continue
+            if blocked_since is not None:
+                continue
+
+            # 멈춘 순간 한 번만 스택 기록
+            blocked_since = time.monotonic() - stalled
+            self.blocked_count += 1
+            LOOP_BLOCKED.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "(스택 없음)"
+            self.last_block = {"at": time.time(), "duration": None, "stack": stack}
+            print(f"🐢 이벤트 루프가 {stalled:.2f}s 이상 멈춤 — 실행 중인 코드:\n{stack}")
+
+    def stats(self) -> dict:
+        return {
+            "max_lag": self.max_lag,
+            "blocked_count": self.blocked_count,
+            "last_block": self.last_block,
+        }
+
+
+# -------------------------------------------------------------------
+# 🔹 샘플링 프로파일러 (flamegraph 용 folded stack 파일)
+# -------------------------------------------------------------------
+class SamplingProfiler:
+    """
+    duration 동안 PROFILE_SAMPLE_SEC 마다 모든 스레드의 스택을 샘플링해서
+    "스레드;바깥 함수;...;안쪽 함수 횟수" 형식(flamegraph.pl / speedscope)으로 저장한다.
+    """
+
+    def __init__(self, out_dir: str = PROFILE_DIR, sample_sec: float = PROFILE_SAMPLE_SEC):
+        self.out_dir = out_dir
+        self.sample_sec = sample_sec
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self, duration: float = PROFILE_DEFAULT_SEC, on_done=None) -> bool:
+        """백그라운드 프로파일 시작 (이미 실행 중이면 False) — 끝나면 on_done(path)"""
+        with self._lock:
+            if self._running:
+                return False
+            self._running = True
+        duration = min(max(duration, 1.0), PROFILE_MAX_SEC)
+        threading.Thread(target=self._run, args=(duration, on_done), name="sampling-profiler", daemon=True).start()
+        return True
+
+    def _run(self, duration: float, on_done):
+        path = None
+        try:
+            path = self.profile(duration)
+            print(f"🔥 프로파일 저장: {path}")
+        except Exception as e:
+            print(f"❌ 프로파일 실패: {e}")
+        finally:
+            with self._lock:
+                self._running = False
+        if on_done is not None:
+            on_done(path)
+
+    def profile(self, duration: float) -> str:
+        me = threading.get_ident()
+        samples = Counter()
+        deadline = time.monotonic() + duration
+        count = 0
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = [names.get(thread_id, str(thread_id))] + folded_stack(frame)
+                samples[";".join(s.replace(";", ":") for s in stack)] += 1
+            count += 1
+            time.sleep(self.sample_sec)
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, n in samples.most_common():
+                f.write(f"{stack} {n}\n")
+        print(f"🔥 샘플 {count}회 / 스택 {len(samples)}종")
+        return path
+
+
+loop_monitor = LoopMonitor()
+profiler = SamplingProfiler()
+
+
+def install_signal_handler(loop=None):
+    """SIGUSR1 → PROFILE_DEFAULT_SEC 동안 프로파일 (Windows 는 미지원)"""
+    import signal
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+
+    def on_signal():
+        if not profiler.start():
+            print("⚠️ 이미 프로파일 중")
+
+    loop = loop or asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGUSR1, on_signal)
+    return True
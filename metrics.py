@@ -0,0 +1,273 @@
+import os
+import re
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))        # 0 이면 엔드포인트 끔
+METRICS_DUMP_FILE = os.getenv("METRICS_DUMP_FILE", "metrics_dump.prom")
+
+# 지연 버킷 (초) — RPC 수 ms ~ 디스코드 / OKX 수 초
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    items = key + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+# -------------------------------------------------------------------
+# 🔹 지표 (기록은 lock + dict 갱신만, 문자열 변환은 수집 요청 시에만)
+# -------------------------------------------------------------------
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(k)} {v}" for k, v in sorted(values.items())]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}   # 라벨 → [버킷별 개수..., +Inf 개수, 합계]
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """수집할 때만 fn() 호출 → 숫자 하나 또는 [(라벨 dict, 값), ...]"""
+
+    def __init__(self, name: str, help_text: str, fn):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            values = self.fn()
+        except Exception as e:
+            return lines + [f"# {self.name} 수집 실패: {e}"]
+        if isinstance(values, (int, float)):
+            lines.append(f"{self.name} {values}")
+        else:
+            lines += [f"{self.name}{_format_labels(_label_key(labels))} {v}" for labels, v in values]
+        return lines
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        return _registry.setdefault(metric.name, metric)
+
+
+def counter(name: str, help_text: str) -> Counter:
+    return _register(Counter(name, help_text))
+
+
+def histogram(name: str, help_text: str, buckets=LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help_text, buckets))
+
+
+def gauge(name: str, help_text: str, fn) -> Gauge:
+    """fn() → 숫자 하나 또는 [(라벨 dict, 값), ...] (같은 이름이면 교체)"""
+    with _registry_lock:
+        _registry[name] = Gauge(name, help_text, fn)
+        return _registry[name]
+
+
+# -------------------------------------------------------------------
+# 🔹 외부 호출 공용 지표
+# -------------------------------------------------------------------
+OUTBOUND_SECONDS = histogram("outbound_request_seconds", "외부 호출 지연 (target = 호스트/서비스, op = RPC 메서드/경로)")
+OUTBOUND_ERRORS = counter("outbound_request_errors_total", "외부 호출 실패 수 (예외 / 429 / 5xx)")
+
+
+@contextmanager
+def timed(target: str, op: str):
+    """with timed("solana", "get_account_info"): ... → 지연 기록, 예외면 에러 카운트"""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        OUTBOUND_ERRORS.inc(target=target, op=op)
+        raise
+    finally:
+        OUTBOUND_SECONDS.observe(time.perf_counter() - start, target=target, op=op)
+
+
+_JSONRPC_METHOD = re.compile(rb'"method"\s*:\s*"([^"]+)"')
+
+
+def jsonrpc_method(body) -> str:
+    """JSON-RPC 요청 본문에서 메서드 이름 (없으면 빈 문자열)"""
+    if isinstance(body, str):
+        body = body.encode()
+    if not body or len(body) > 8192:
+        return ""
+    match = _JSONRPC_METHOD.search(body)
+    return match.group(1).decode() if match else ""
+
+
+class TimedClient:
+    """객체의 메서드 호출을 timed(target, 메서드명) 으로 감싼 프록시 (solana Client 용)"""
+
+    def __init__(self, inner, target: str):
+        self._inner = inner
+        self._target = target
+
+    def __getattr__(self, name):
+        attr = getattr(self._inner, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        def call(*args, **kwargs):
+            with timed(self._target, name):
+                return attr(*args, **kwargs)
+
+        return call
+
+
+def _discord_op(route) -> str:
+    return f"{getattr(route, 'method', '?')} {getattr(route, 'path', '?')}"
+
+
+def instrument_discord(bot):
+    """디스코드 REST 호출(채널 메시지 / 인터랙션 응답 · followup) 지연 기록"""
+    from discord.webhook.async_ import AsyncWebhookAdapter
+
+    http_request = bot.http.request
+
+    async def timed_http_request(route, *args, **kwargs):
+        with timed("discord", _discord_op(route)):
+            return await http_request(route, *args, **kwargs)
+
+    bot.http.request = timed_http_request
+
+    # 인터랙션 응답 / followup 은 웹훅 어댑터를 거친다
+    webhook_request = AsyncWebhookAdapter.request
+    if getattr(webhook_request, "_timed", False):
+        return
+
+    async def timed_webhook_request(self, route, *args, **kwargs):
+        with timed("discord", _discord_op(route)):
+            return await webhook_request(self, route, *args, **kwargs)
+
+    timed_webhook_request._timed = True
+    AsyncWebhookAdapter.request = timed_webhook_request
+
+
+# -------------------------------------------------------------------
+# 🔹 Prometheus 텍스트 / 엔드포인트 / 종료 시 덤프
+# -------------------------------------------------------------------
+def render() -> str:
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = []
+    for metric in metrics:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+
+
+def start_server(host: str = METRICS_HOST, port: int = METRICS_PORT):
+    """/metrics 엔드포인트 (데몬 스레드) — 수집 요청이 없으면 아무 일도 하지 않음"""
+    global _server
+    if _server is not None or not port:
+        return _server
+    try:
+        _server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        print(f"⚠️ 지표 엔드포인트 시작 실패 ({host}:{port}): {e}")
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"📈 지표 엔드포인트: http://{host}:{port}/metrics")
+    return _server
+
+
+def dump(path: str = METRICS_DUMP_FILE):
+    """종료 시 현재 지표를 파일로 저장"""
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render())
+        print(f"📈 지표 덤프 저장: {path}")
+    except Exception as e:
+        print(f"⚠️ 지표 덤프 실패: {e}")
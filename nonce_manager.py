@@ -0,0 +1,105 @@
+import heapq
+import threading
+
+# nonce 관련 노드 에러 메시지 (이 경우 pending 카운트로 다시 동기화)
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "already known",
+    "replacement transaction underpriced",
+    "known transaction",
+)
+
+
+def is_nonce_error(e: Exception) -> bool:
+    msg = str(e).lower()
+    return any(key in msg for key in NONCE_ERRORS)
+
+
+# -------------------------------------------------------------------
+# 🔹 로컬 nonce 관리자
+# -------------------------------------------------------------------
+class NonceManager:
+    """
+    주소별 nonce 를 메모리에서 발급한다.
+    - 최초 발급 시 / 에러 후 pending 트랜잭션 수로 동기화
+    - 전송 실패로 비어버린 nonce(gap)는 다음 발급 때 먼저 채운다
+    """
+
+    def __init__(self, w3, address: str):
+        self.w3 = w3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next = None          # 다음에 새로 발급할 nonce
+        self._gaps = []            # 다시 써야 하는 nonce (min-heap)
+        self._allocated = set()    # 발급됐지만 아직 전송 결과를 모르는 nonce
+        self._sent = set()         # 전송 성공한 nonce (pending 아래로 내려가면 정리)
+
+    def _pending_count(self) -> int:
+        return self.w3.eth.get_transaction_count(self.address, "pending")
+
+    def _sync_locked(self):
+        pending = self._pending_count()
+        if self._next is None or pending > self._next:
+            self._next = pending
+
+        self._sent = {n for n in self._sent if n >= pending}
+        gaps = {n for n in self._gaps if n >= pending}
+
+        # pending ~ _next 사이에서 진행 중도, 전송 완료도 아닌 nonce → gap
+        for n in range(pending, self._next):
+            if n not in self._allocated and n not in self._sent:
+                gaps.add(n)
+        # pending 자리에 있어야 할 트랜잭션이 빠졌다면 그 nonce 도 다시 채운다
+        if pending < self._next and pending not in self._allocated:
+            self._sent.discard(pending)
+            gaps.add(pending)
+
+        self._gaps = sorted(gaps)
+
+    def sync(self):
+        """노드의 pending 카운트로 다시 동기화"""
+        with self._lock:
+            self._sync_locked()
+
+    def allocate(self) -> int:
+        with self._lock:
+            if self._next is None:
+                self._sync_locked()
+            if self._gaps:
+                nonce = heapq.heappop(self._gaps)
+            else:
+                nonce = self._next
+                self._next += 1
+            self._allocated.add(nonce)
+            return nonce
+
+    def mark_sent(self, nonce: int):
+        """브로드캐스트 성공"""
+        with self._lock:
+            self._allocated.discard(nonce)
+            self._sent.add(nonce)
+
+    def release(self, nonce: int, error: Exception = None):
+        """브로드캐스트 실패 → nonce 반납 (nonce 에러면 재동기화)"""
+        with self._lock:
+            self._allocated.discard(nonce)
+            if error is not None and is_nonce_error(error):
+                self._sync_locked()
+            elif nonce not in self._sent:
+                heapq.heappush(self._gaps, nonce)
+
+
+# -------------------------------------------------------------------
+# 🔹 주소별 공유 인스턴스 (eth_coin / eth_okx_dex_API 공용)
+# -------------------------------------------------------------------
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_nonce_manager(w3, address: str) -> NonceManager:
+    key = address.lower()
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = NonceManager(w3, address)
+        return _managers[key]
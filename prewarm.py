@@ -0,0 +1,108 @@
+import os
+import time
+import asyncio
+from decimal import Decimal
+
+from transfer_executor import transfer_executor
+from chain_backends import lazy
+
+# 등록 시 매수 금액 (RegisterModal 과 공용)
+ETH_REGISTER_BUY = Decimal(os.getenv("ETH_REGISTER_BUY", "0.00025"))  # ETH
+SOL_REGISTER_BUY = Decimal(os.getenv("SOL_REGISTER_BUY", "0.0025"))   # SOL
+
+# OKX 견적은 금방 낡으므로 TTL 이 지나기 전에 다시 받아둔다
+PREWARM_TTL_SEC = float(os.getenv("PREWARM_TTL_SEC", "30"))
+PREWARM_MAX_AGE_SEC = float(os.getenv("PREWARM_MAX_AGE_SEC", "900"))  # 관리자가 등록하지 않으면 이후 갱신 중단
+
+get_erc20_decimals = lazy("eth_coin", "get_erc20_decimals")
+fetch_eth_swap_tx = lazy("eth_okx_dex_API", "fetch_eth_swap_tx")
+get_spl_decimals = lazy("sol_coin", "get_spl_decimals")
+get_token_meta = lazy("sol_coin", "get_token_meta")
+fetch_sol_swap_data = lazy("sol_okx_dex_API", "fetch_sol_swap_data")
+resolve_sol_swap = lazy("sol_okx_dex_API", "resolve_sol_swap")
+
+
+def register_buy_amount(chain: str) -> int:
+    """등록 매수 금액 (wei / lamports)"""
+    if chain == "eth":
+        return int(ETH_REGISTER_BUY * 10**18)
+    return int(SOL_REGISTER_BUY * 10**9)
+
+
+# -------------------------------------------------------------------
+# 체인별 준비 작업 (워커 스레드에서 실행)
+# -------------------------------------------------------------------
+def prepare_eth(address: str) -> dict:
+    decimals = get_erc20_decimals(address)
+    swap = fetch_eth_swap_tx(address, register_buy_amount("eth"))
+    return {"decimals": decimals, "swap": swap}
+
+def prepare_sol(address: str) -> dict:
+    decimals = get_spl_decimals(address)
+    get_token_meta(address)   # 토큰 프로그램 → token_cache (기본 지갑 ATA 는 메모리)
+    # ALT 조회 / 우선순위 수수료까지 미리 → 등록 시 서명 + 전송만
+    swap = resolve_sol_swap(fetch_sol_swap_data(address, register_buy_amount("sol")))
+    return {"decimals": decimals, "swap": swap}
+
+PREPARE_FUNCS = {"eth": prepare_eth, "sol": prepare_sol}
+
+
+# -------------------------------------------------------------------
+# 🔹 신규 에어드랍 스왑 사전 준비
+# -------------------------------------------------------------------
+class SwapPrewarmer:
+    """
+    공지에서 컨트랙트가 보이면 바로 decimals / 토큰 프로그램 / OKX 스왑 데이터 (SOL: ALT · 우선순위 수수료 포함) 를 준비해두고,
+    관리자가 등록하면 take() 로 꺼내 서명 + 전송만 하게 한다.
+    스왑 데이터는 PREWARM_TTL_SEC 보다 조금 일찍 주기적으로 갱신한다.
+    """
+
+    def __init__(self, ttl: float = PREWARM_TTL_SEC, max_age: float = PREWARM_MAX_AGE_SEC):
+        self.ttl = ttl
+        self.max_age = max_age
+        self._ready = {}   # (chain, address) → (준비 시각, payload)
+        self._tasks = {}   # (chain, address) → 갱신 task
+
+    @staticmethod
+    def _key(chain: str, address: str):
+        address = address.strip()
+        return chain, address.lower() if chain == "eth" else address
+
+    def schedule(self, chain: str, address: str):
+        """이벤트 루프에서 호출 — 이미 준비 중이면 무시"""
+        if chain not in PREPARE_FUNCS:
+            return
+        key = self._key(chain, address)
+        if key in self._tasks:
+            return
+        self._tasks[key] = asyncio.create_task(self._run(key, address.strip()))
+
+    async def _run(self, key, address: str):
+        chain = key[0]
+        started = time.monotonic()
+        try:
+            while time.monotonic() - started < self.max_age:
+                try:
+                    payload = await transfer_executor.run(chain, PREPARE_FUNCS[chain], address)
+                    self._ready[key] = (time.monotonic(), payload)
+                    print(f"🔥 스왑 사전 준비 완료 ({chain}:{address})")
+                except Exception as e:
+                    print(f"⚠️ 스왑 사전 준비 실패 ({chain}:{address}): {e}")
+                await asyncio.sleep(self.ttl * 0.8)
+        finally:
+            self._tasks.pop(key, None)
+            self._ready.pop(key, None)
+
+    def take(self, chain: str, address: str):
+        """신선한 준비 데이터 (1회용) — 없거나 만료됐으면 None"""
+        key = self._key(chain, address)
+        entry = self._ready.pop(key, None)
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+
+swap_prewarmer = SwapPrewarmer()
@@ -0,0 +1,106 @@
+import os
+import time
+import struct
+import threading
+from dotenv import load_dotenv
+
+from solders.pubkey import Pubkey
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+
+import http_client
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+COMPUTE_BUDGET_PROGRAM_ID = Pubkey.from_string("ComputeBudget111111111111111111111111111111")
+SET_COMPUTE_UNIT_LIMIT = 2
+SET_COMPUTE_UNIT_PRICE = 3
+
+# 최근 슬롯 우선순위 수수료 중 이 백분위수 사용 (micro-lamports / CU)
+PRIORITY_FEE_PERCENTILE = float(os.getenv("SOL_PRIORITY_FEE_PERCENTILE", "75"))
+PRIORITY_FEE_MIN = int(os.getenv("SOL_PRIORITY_FEE_MIN", "1000"))
+PRIORITY_FEE_MAX = int(os.getenv("SOL_PRIORITY_FEE_MAX", "2000000"))
+# 같은 계정 조합이면 이 시간 동안 조회 결과 재사용 (스왑마다 RPC 1회 방지)
+PRIORITY_FEE_CACHE_SEC = float(os.getenv("SOL_PRIORITY_FEE_CACHE_SEC", "10"))
+# OKX 가 compute limit 을 주지 않을 때 기본값
+SWAP_COMPUTE_UNITS = int(os.getenv("SOL_SWAP_COMPUTE_UNITS", "400000"))
+
+
+def split_compute_budget(instructions: list) -> tuple:
+    """(ComputeBudget 제외 instruction 목록, 원래 지정된 compute unit limit 또는 None)"""
+    others = []
+    unit_limit = None
+    for ix in instructions:
+        if ix.program_id != COMPUTE_BUDGET_PROGRAM_ID:
+            others.append(ix)
+            continue
+        data = bytes(ix.data)
+        if data and data[0] == SET_COMPUTE_UNIT_LIMIT and len(data) >= 5:
+            unit_limit = struct.unpack_from("<I", data, 1)[0]
+    return others, unit_limit
+
+
+def percentile(values: list, pct: float) -> int:
+    if not values:
+        return 0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+_fee_cache = {}   # 쓰기 계정 tuple → (조회 시각, 수수료 샘플 목록)
+_fee_lock = threading.Lock()
+
+
+def fetch_prioritization_fees(writable_accounts: list) -> list:
+    """getRecentPrioritizationFees 직접 호출 (solana-py 동기 Client 에는 없는 메서드)"""
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getRecentPrioritizationFees",
+        "params": [[str(a) for a in writable_accounts]],
+    }
+    resp = http_client.post(http_client.SOL_RPC_URL, json=payload).json()
+    if "error" in resp:
+        raise Exception(f"getRecentPrioritizationFees 실패: {resp['error']}")
+    return [s["prioritizationFee"] for s in resp.get("result") or []]
+
+
+def recent_priority_fee(writable_accounts: list) -> int:
+    """쓰기 계정 기준 최근 우선순위 수수료 백분위수 (MIN~MAX 로 제한)"""
+    key = tuple(str(a) for a in writable_accounts[:128])
+    now = time.monotonic()
+    with _fee_lock:
+        cached = _fee_cache.get(key)
+    if cached is not None and now - cached[0] < PRIORITY_FEE_CACHE_SEC:
+        samples = cached[1]
+    else:
+        try:
+            samples = fetch_prioritization_fees(list(key))
+        except Exception as e:
+            print(f"⚠️ 우선순위 수수료 조회 실패 → 최소값 사용: {e}")
+            samples = []
+        with _fee_lock:
+            for k in [k for k, (at, _) in _fee_cache.items() if now - at >= PRIORITY_FEE_CACHE_SEC]:
+                del _fee_cache[k]
+            _fee_cache[key] = (now, samples)
+    fee = percentile(samples, PRIORITY_FEE_PERCENTILE)
+    return min(PRIORITY_FEE_MAX, max(PRIORITY_FEE_MIN, fee))
+
+
+def with_compute_budget(instructions: list) -> list:
+    """
+    OKX 가 넣은 ComputeBudget instruction 을 빼고
+    compute unit limit (OKX 값 우선) + 최근 수수료 기반 price 를 맨 앞에 다시 넣는다.
+    """
+    others, unit_limit = split_compute_budget(instructions)
+    writable = list(dict.fromkeys(
+        meta.pubkey for ix in others for meta in ix.accounts if meta.is_writable
+    ))
+    price = recent_priority_fee(writable)
+    return [
+        set_compute_unit_limit(unit_limit or SWAP_COMPUTE_UNITS),
+        set_compute_unit_price(price),
+    ] + others
@@ -3,12 +3,12 @@ import json
 import base58
 from dotenv import load_dotenv
 
-from solana.rpc.api import Client
 from solana.rpc.types import TxOpts
 from solders.transaction import Transaction
 from solders.message import Message
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
+from solders.signature import Signature
 from solders.instruction import Instruction as TransactionInstruction, AccountMeta
 from solders.sysvar import RENT
 from solders.system_program import ID as SYS_PROGRAM_ID
@@ -19,20 +19,41 @@ from spl.token.constants import (
     ASSOCIATED_TOKEN_PROGRAM_ID,
 )
 
+import http_client
+from token_cache import token_cache
+from blockhash_cache import send_with_blockhash_retry, current_signature
+from wallet_pool import WalletPool, HotWallet, load_keys
+
 # -------------------------------------------------------------------
 # ⚙️ 설정
 # -------------------------------------------------------------------
 load_dotenv()
-SOL_PRIVATE_KEY = os.getenv("SOL_PRIVATE_KEY")
+# 핫월렛 개인키 목록 (SOL_PRIVATE_KEYS=키1,키2,... / 없으면 SOL_PRIVATE_KEY 하나)
+SOL_PRIVATE_KEYS = load_keys("SOL_PRIVATE_KEYS", "SOL_PRIVATE_KEY")
+
+# 핫월렛 풀 (처음 필요할 때 1회 디코딩)
+_wallets = None
+
+def get_wallet_pool() -> WalletPool:
+    global _wallets
+    if _wallets is None:
+        keypairs = [Keypair.from_bytes(base58.b58decode(key)) for key in SOL_PRIVATE_KEYS]
+        _wallets = WalletPool("sol", [HotWallet(str(kp.pubkey()), kp) for kp in keypairs], spl_balance)
+    return _wallets
 
-# 개인키 로드
-secret = base58.b58decode(SOL_PRIVATE_KEY)
-kp = Keypair.from_bytes(secret)
-client = Client("https://api.mainnet-beta.solana.com")
+def get_keypair() -> Keypair:
+    """기본(첫 번째) 지갑"""
+    return get_wallet_pool().primary.signer
+client = http_client.get_solana_client()
 
 # 토큰 데이터 저장 파일
 TOKENS_FILE = "tokens.json"
 
+# 배치 전송 한도 (트랜잭션 크기 / 컴퓨트 유닛)
+MAX_TX_SIZE = 1232                 # 패킷 1232 bytes
+MAX_COMPUTE_UNITS = 1_400_000      # 트랜잭션당 최대 CU
+COMPUTE_UNITS_PER_TRANSFER = 40_000  # ATA 생성(최초) + transfer 여유 포함
+
 
 # -------------------------------------------------------------------
 # 🔹 유틸 함수
@@ -100,19 +121,42 @@ def detect_token_program(mint: Pubkey) -> Pubkey:
 
 
 # -------------------------------------------------------------------
-# 🔹 SPL Token 전송
+# 🔹 토큰 메타데이터 (캐시 우선, 없으면 RPC 조회 후 저장)
 # -------------------------------------------------------------------
-def send_spl_token(mint_address: str, wallet_address: str, amount: float, decimals: int):
-    mint = Pubkey.from_string(mint_address)
-    sender = kp.pubkey()
-    wallet = Pubkey.from_string(wallet_address)
+_ata_cache = {}   # (지갑, mint) → ATA (지갑마다 로컬 계산, RPC 없음)
 
-    program_id = detect_token_program(mint)
-    sender_ata = derive_ata(sender, mint, program_id)
-    recipient_ata = derive_ata(wallet, mint, program_id)
+def get_token_meta(mint_address: str, owner: Pubkey = None) -> tuple:
+    """(token program id, owner(기본: 첫 번째 지갑) 의 ATA)"""
+    owner = owner or get_keypair().pubkey()
+    cached = token_cache.get("sol", mint_address)
+    if cached.get("token_program"):
+        program_id = Pubkey.from_string(cached["token_program"])
+    else:
+        program_id = detect_token_program(Pubkey.from_string(mint_address))
+        token_cache.update("sol", mint_address, token_program=str(program_id))
+
+    key = (str(owner), mint_address)
+    ata = _ata_cache.get(key)
+    if ata is None:
+        ata = _ata_cache[key] = derive_ata(owner, Pubkey.from_string(mint_address), program_id)
+    return program_id, ata
 
-    lamports = int(amount * (10 ** decimals))
 
+def spl_balance(wallet: HotWallet, mint_address: str) -> int:
+    """핫월렛의 토큰 잔액 (raw) — ATA 가 없으면 RPC 가 에러 응답(.value 없음)을 주므로 0"""
+    _, ata = get_token_meta(mint_address, wallet.signer.pubkey())
+    value = getattr(client.get_token_account_balance(ata), "value", None)
+    return int(value.amount) if value is not None else 0
+
+
+# -------------------------------------------------------------------
+# 🔹 SPL Token 전송
+# -------------------------------------------------------------------
+def build_transfer_instructions(
+    sender: Pubkey, sender_ata: Pubkey, wallet: Pubkey, mint: Pubkey, program_id: Pubkey, lamports: int
+) -> list:
+    """수신자 1명분 [idempotent ATA 생성, transfer] Instruction"""
+    recipient_ata = derive_ata(wallet, mint, program_id)
     create_ata_ix = create_associated_token_account_idempotent(
         payer=sender, owner=wallet, mint=mint, token_program_id=program_id
     )
@@ -126,22 +170,154 @@ def send_spl_token(mint_address: str, wallet_address: str, amount: float, decima
             signers=[],
         )
     )
+    return [create_ata_ix, transfer_ix]
+
+
+def send_spl_token(mint_address: str, wallet_address: str, amount: float, decimals: int, wallet: HotWallet = None):
+    """wallet: 보내는 핫월렛 (없으면 잔액이 충분하고 가장 한가한 지갑)"""
+    mint = Pubkey.from_string(mint_address)
+    recipient = Pubkey.from_string(wallet_address)
+    lamports = int(amount * (10 ** decimals))
 
-    recent_blockhash = client.get_latest_blockhash().value.blockhash
-    msg = Message([create_ata_ix, transfer_ix], payer=sender)
-    txn = Transaction([kp], msg, recent_blockhash)
+    with get_wallet_pool().use(mint_address, lamports, wallet) as hot:
+        kp = hot.signer
+        sender = kp.pubkey()
+        program_id, sender_ata = get_token_meta(mint_address, sender)
 
-    sig = client.send_raw_transaction(bytes(txn), opts=TxOpts(skip_preflight=True))
+        instructions = build_transfer_instructions(sender, sender_ata, recipient, mint, program_id, lamports)
+
+        msg = Message(instructions, payer=sender)
+
+        # ✅ 캐시된 blockhash 로 서명 (만료 시 재서명 후 재전송)
+        sig = send_with_blockhash_retry(
+            client,
+            lambda blockhash: Transaction([kp], msg, blockhash),
+            opts=TxOpts(skip_preflight=True),
+        )
     return sig.value
 
 
+# -------------------------------------------------------------------
+# 🔹 SPL Token 배치 전송 (여러 수신자 → 트랜잭션 1개)
+# -------------------------------------------------------------------
+def tx_size(msg: Message, num_signers: int = 1) -> int:
+    """서명 포함 직렬화 크기 (compact-u16 서명 개수 + 서명 64 bytes * n + 메시지)"""
+    return 1 + 64 * num_signers + len(bytes(msg))
+
+
+def pack_transfer_batches(sender: Pubkey, pairs: list) -> list:
+    """
+    pairs: [(index, [ix, ix]), ...] 를 크기 / CU 한도 안에서 최대한 묶는다
+    반환: [[(index, [ix, ix]), ...], ...] (트랜잭션 단위)
+    """
+    batches = []
+    current = []
+    for pair in pairs:
+        candidate = current + [pair]
+        instructions = [ix for _, ixs in candidate for ix in ixs]
+        too_many_cu = len(candidate) * COMPUTE_UNITS_PER_TRANSFER > MAX_COMPUTE_UNITS
+        too_large = tx_size(Message(instructions, payer=sender)) > MAX_TX_SIZE
+        if current and (too_many_cu or too_large):
+            batches.append(current)
+            current = [pair]
+        else:
+            current = candidate
+    if current:
+        batches.append(current)
+    return batches
+
+
+def send_spl_token_batch(mint_address: str, recipients: list, decimals: int, wallet: HotWallet = None) -> list:
+    """
+    recipients: [(wallet_address, amount), ...]
+    wallet: 보내는 핫월렛 (없으면 배치마다 잔액이 충분하고 가장 한가한 지갑)
+    반환: 수신자 순서대로 트랜잭션 서명 또는 Exception
+    """
+    mint = Pubkey.from_string(mint_address)
+    pool = get_wallet_pool()
+    # 배치 크기 계산은 기본 지갑 기준 (지갑마다 계정 수가 같으므로 크기도 같음)
+    packer = get_keypair().pubkey()
+    program_id, packer_ata = get_token_meta(mint_address, packer)
+
+    results = [None] * len(recipients)
+    transfers = {}   # 수신자 index → (지갑 Pubkey, lamports)
+    pairs = []
+    for i, (wallet_address, amount) in enumerate(recipients):
+        try:
+            recipient = Pubkey.from_string(wallet_address)
+        except Exception as e:
+            results[i] = ValueError(f"잘못된 지갑 주소: {wallet_address} ({e})")
+            continue
+        lamports = int(amount * (10 ** decimals))
+        transfers[i] = (recipient, lamports)
+        pairs.append((i, build_transfer_instructions(packer, packer_ata, recipient, mint, program_id, lamports)))
+
+    for batch in pack_transfer_batches(packer, pairs):
+        total = sum(transfers[i][1] for i, _ in batch)
+        try:
+            with pool.use(mint_address, total, wallet) as hot:
+                kp = hot.signer
+                sender = kp.pubkey()
+                if sender == packer:
+                    instructions = [ix for _, ixs in batch for ix in ixs]
+                else:
+                    _, sender_ata = get_token_meta(mint_address, sender)
+                    instructions = [
+                        ix for i, _ in batch
+                        for ix in build_transfer_instructions(sender, sender_ata, transfers[i][0], mint, program_id, transfers[i][1])
+                    ]
+                msg = Message(instructions, payer=sender)
+                sig = send_with_blockhash_retry(
+                    client,
+                    lambda blockhash: Transaction([kp], msg, blockhash),
+                    opts=TxOpts(skip_preflight=True),
+                ).value
+            print(f"📦 SPL 배치 전송: {len(batch)}명 ({hot.address[:8]}…) → {sig}")
+            for i, _ in batch:
+                results[i] = sig
+        except Exception as e:
+            for i, _ in batch:
+                results[i] = e
+
+    return results
+
+
 # -------------------------------------------------------------------
 # 🔹 SPL Token decimals 조회
 # -------------------------------------------------------------------
 def get_spl_decimals(mint_address: str) -> int:
-    """Solana 토큰 decimals 조회"""
+    """Solana 토큰 decimals 조회 (캐시 우선)"""
+    cached = token_cache.get("sol", mint_address)
+    if "decimals" in cached:
+        return cached["decimals"]
+
     resp = client.get_token_supply(Pubkey.from_string(mint_address))
     if resp.value:
+        token_cache.update("sol", mint_address, decimals=resp.value.decimals)
         return resp.value.decimals
     else:
         raise ValueError("❌ Mint account not found")
+
+
+# -------------------------------------------------------------------
+# 🔹 서명 상태 조회 (확정 추적용, 최대 256개씩 한 번에)
+# -------------------------------------------------------------------
+def get_signature_statuses(signatures: list) -> dict:
+    """{서명: "confirmed" | "failed" | None(아직 없음)}"""
+    result = {}
+    for start in range(0, len(signatures), 256):
+        chunk = signatures[start:start + 256]
+        # 만료돼서 재전송된 트랜잭션은 새 서명으로 조회
+        resp = client.get_signature_statuses([Signature.from_string(current_signature(s)) for s in chunk])
+        for sig, status in zip(chunk, resp.value):
+            if status is None:
+                result[sig] = None
+            elif status.err is not None:
+                result[sig] = "failed"
+            elif status.confirmation_status is not None:
+                # processed 는 아직 확정 아님
+                level = str(status.confirmation_status).lower()
+                result[sig] = "confirmed" if ("confirmed" in level or "finalized" in level) else None
+            else:
+                result[sig] = None
+    return result
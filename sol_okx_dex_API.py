@@ -1,27 +1,29 @@
 import os
 import base64
-import base58
-import requests
 import datetime
 import urllib.parse
 import hmac, base64 as b64
 from dotenv import load_dotenv
 
-from solana.rpc.api import Client
 from solana.rpc.types import TxOpts
 
 from solders.transaction import VersionedTransaction
-from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.instruction import Instruction, AccountMeta
 from solders.message import MessageV0
 from solders.system_program import transfer, TransferParams
-import nacl.signing
 
 # SPL Token (주소 계산만 사용)
 from spl.token.constants import WRAPPED_SOL_MINT, TOKEN_PROGRAM_ID, ASSOCIATED_TOKEN_PROGRAM_ID
 from spl.token.instructions import get_associated_token_address
 
+import http_client
+from sol_coin import get_keypair
+from blockhash_cache import send_with_blockhash_retry
+from wsol_maintainer import WsolMaintainer
+from lookup_tables import get_lookup_table_cache
+from priority_fees import with_compute_budget
+
 load_dotenv()
 
 # ---------------------------------------------------------
@@ -32,12 +34,11 @@ OKX_SECRET_KEY = os.getenv("OKX_SECRET_KEY")
 OKX_API_PASSPHRASE = os.getenv("OKX_API_PASSPHRASE")
 OKX_PROJECT_ID = os.getenv("OKX_PROJECT_ID")
 
-SOL_PRIVATE_KEY = os.getenv("SOL_PRIVATE_KEY")  # base58 인코딩된 개인키
-SOL_ADDRESS = os.getenv("SOL_ADDRESS")          # 지갑 주소
+# 스왑 지갑 = sol_coin 핫월렛 풀의 기본(첫 번째) 지갑 (SOL_PRIVATE_KEYS / SOL_PRIVATE_KEY)
 
-client = Client("https://api.mainnet-beta.solana.com")
+client = http_client.get_solana_client()
 CHAIN_INDEX = "501"
-BASE_URL = "https://www.okx.com"
+BASE_URL = os.getenv("OKX_BASE_URL", "https://www.okx.com")
 
 
 # ---------------------------------------------------------
@@ -64,19 +65,6 @@ def get_headers(method: str, path: str, params: dict = None, body: str = ""):
     }
 
 
-# ---------------------------------------------------------
-# Keypair 로딩
-# ---------------------------------------------------------
-def load_keypair_from_base58(b58_key: str) -> Keypair:
-    secret = base58.b58decode(b58_key)
-    if len(secret) == 32:
-        sk = nacl.signing.SigningKey(secret)
-        secret = sk.encode() + sk.verify_key.encode()
-    elif len(secret) != 64:
-        raise ValueError("지원되지 않는 키 형식 (32 또는 64 바이트여야 함)")
-    return Keypair.from_bytes(secret)
-
-
 # ---------------------------------------------------------
 # Instruction Helpers (solders 전용)
 # ---------------------------------------------------------
@@ -108,65 +96,55 @@ def sync_native_solders(account: Pubkey) -> Instruction:
 
 
 # ---------------------------------------------------------
-# wSOL ATA 체크 및 래핑
+# wSOL 래핑 (잔액 관리는 백그라운드 WsolMaintainer 가 담당)
 # ---------------------------------------------------------
-def ensure_wsol_account():
-    owner = Pubkey.from_string(SOL_ADDRESS)
+def wrap_sol(lamports: int, create_ata: bool = False) -> str:
+    """SOL → wSOL 입금 트랜잭션 전송 → 서명"""
+    kp = get_keypair()
+    owner = kp.pubkey()
     wsol_ata = get_associated_token_address(owner, WRAPPED_SOL_MINT)
+    instructions = []
 
-    # 현재 wSOL ATA 잔액 확인
-    balance_resp = client.get_token_account_balance(wsol_ata)
-    current_balance = 0
-    if balance_resp.value is not None:
-        current_balance = int(balance_resp.value.amount)  # lamports 단위
-
-    print(f"[INFO] 현재 wSOL 잔액: {current_balance} lamports")
-
-    target_lamports = 7_500_000  # 최소 확보해야 할 wSOL = 0.005 SOL
-
-    if current_balance < target_lamports:
-        wrap_amount = target_lamports - current_balance
-        print(f"[INFO] {wrap_amount} lamports SOL → wSOL 래핑 (목표: {target_lamports})")
-
-        info = client.get_account_info(wsol_ata)
-        instructions = []
-
-        if info.value is None:
-            print("[INFO] wSOL ATA 없음 → 생성")
-            instructions.append(
-                create_associated_token_account_solders(
-                    payer=owner,
-                    owner=owner,
-                    mint=WRAPPED_SOL_MINT,
-                )
-            )
-
-        # SOL → wSOL 입금
+    if create_ata:
+        print("[INFO] wSOL ATA 없음 → 생성")
         instructions.append(
-            transfer(TransferParams(from_pubkey=owner, to_pubkey=wsol_ata, lamports=wrap_amount))
+            create_associated_token_account_solders(
+                payer=owner,
+                owner=owner,
+                mint=WRAPPED_SOL_MINT,
+            )
         )
 
-        # sync_native 호출
-        instructions.append(sync_native_solders(wsol_ata))
+    # SOL → wSOL 입금
+    instructions.append(
+        transfer(TransferParams(from_pubkey=owner, to_pubkey=wsol_ata, lamports=lamports))
+    )
 
-        # 트랜잭션 실행
-        bh_resp = client.get_latest_blockhash()
-        blockhash = bh_resp.value.blockhash
+    # sync_native 호출
+    instructions.append(sync_native_solders(wsol_ata))
 
-        kp = load_keypair_from_base58(SOL_PRIVATE_KEY)
+    # 트랜잭션 실행 (캐시된 blockhash 사용)
+    def build_tx(blockhash):
         msg = MessageV0.try_compile(
             payer=owner,
             instructions=instructions,
             address_lookup_table_accounts=[],
             recent_blockhash=blockhash,
         )
-        tx = VersionedTransaction(msg, [kp])
-        sig = client.send_raw_transaction(bytes(tx), opts=TxOpts(skip_preflight=True))
-        print("[INFO] wSOL 래핑 완료:", sig.value)
-    else:
-        print("[INFO] 이미 0.005 SOL 이상 보유 → 추가 래핑 없음")
+        return VersionedTransaction(msg, [kp])
+
+    sig = send_with_blockhash_retry(client, build_tx, opts=TxOpts(skip_preflight=True))
+    return sig.value
+
+
+_wsol_maintainer = None
 
-    return wsol_ata
+def get_wsol_maintainer() -> WsolMaintainer:
+    global _wsol_maintainer
+    if _wsol_maintainer is None:
+        wsol_ata = get_associated_token_address(get_keypair().pubkey(), WRAPPED_SOL_MINT)
+        _wsol_maintainer = WsolMaintainer(client, wsol_ata, wrap_sol)
+    return _wsol_maintainer
 
 
 
@@ -199,11 +177,8 @@ def build_instructions(instr_list: list) -> list:
 # ---------------------------------------------------------
 # SOL → SPL 토큰 스왑 실행
 # ---------------------------------------------------------
-def swap_sol_to_token_instruction(to_token_address: str, lamports: int, slippage="5") -> str:
-    # 1. 먼저 wSOL 준비 (0.005 SOL 채워놓음)
-    ensure_wsol_account()
-
-    # 2. OKX aggregator swap instruction API
+def fetch_sol_swap_data(to_token_address: str, lamports: int, slippage="5") -> dict:
+    """OKX 스왑 instruction 데이터 (서명 전) — 사전 준비(prewarm)에서도 사용"""
     path = "/api/v6/dex/aggregator/swap-instruction"
     params = {
         "chainIndex": CHAIN_INDEX,
@@ -211,37 +186,60 @@ def swap_sol_to_token_instruction(to_token_address: str, lamports: int, slippage
         "toTokenAddress": to_token_address,
         "amount": str(lamports),   # ✅ 스왑은 매개변수 lamports 사용
         "slippagePercent": slippage,
-        "userWalletAddress": SOL_ADDRESS,
+        "userWalletAddress": str(get_keypair().pubkey()),
     }
     headers = get_headers("GET", path, params=params)
-    resp = requests.get(BASE_URL + path, headers=headers, params=params).json()
+    resp = http_client.get(BASE_URL + path, headers=headers, params=params).json()
     print("DEBUG Swap API Response:", resp)
 
     if resp.get("code") != "0" or not resp.get("data"):
         raise Exception(f"Swap-instruction API failed: {resp}")
 
-    swap_data = resp["data"]
-    instr_list = swap_data["instructionLists"]
+    return resp["data"]
+
+
+def resolve_sol_swap(swap_data: dict) -> dict:
+    """
+    OKX 스왑 데이터 → 서명 직전 상태 (RPC 가 필요한 작업은 여기서 끝냄)
+    - ComputeBudget 은 최근 수수료 기반으로 다시 설정
+    - OKX 가 알려준 Address Lookup Table 로 계정 주소를 1바이트 인덱스로 압축
+    사전 준비(prewarm)에서 미리 호출해두면 등록 시에는 서명 + 전송만 한다.
+    """
+    return {
+        "instructions": with_compute_budget(build_instructions(swap_data["instructionLists"])),
+        "lookup_tables": get_lookup_table_cache(client).get_many(swap_data.get("addressLookupTableAccount") or []),
+    }
 
-    # Instruction 생성
-    instructions = build_instructions(instr_list)
 
-    # 최신 blockhash
-    bh_resp = client.get_latest_blockhash()
-    blockhash = bh_resp.value.blockhash
+def swap_sol_to_token_instruction(to_token_address: str, lamports: int, slippage="5", prepared: dict = None) -> str:
+    """prepared: resolve_sol_swap() 결과 (없으면 OKX 요청부터)"""
+    resolved = prepared or resolve_sol_swap(fetch_sol_swap_data(to_token_address, lamports, slippage))
+    instructions = resolved["instructions"]
+    lookup_tables = resolved["lookup_tables"]
 
-    # 트랜잭션 생성 및 서명
-    keypair = load_keypair_from_base58(SOL_PRIVATE_KEY)
-    msg = MessageV0.try_compile(
-        payer=Pubkey.from_string(SOL_ADDRESS),
-        instructions=instructions,
-        address_lookup_table_accounts=[],
-        recent_blockhash=blockhash,
-    )
-    tx = VersionedTransaction(msg, [keypair])
+    # 트랜잭션 생성 및 서명 (캐시된 blockhash 사용)
+    keypair = get_keypair()
 
-    # 전송
-    result = client.send_raw_transaction(bytes(tx), opts=TxOpts(skip_preflight=True))
+    def build_tx(blockhash):
+        msg = MessageV0.try_compile(
+            payer=keypair.pubkey(),
+            instructions=instructions,
+            address_lookup_table_accounts=lookup_tables,
+            recent_blockhash=blockhash,
+        )
+        return VersionedTransaction(msg, [keypair])
+
+    # wSOL 은 백그라운드에서 채워둔 잔액에서 차감 (잔액 조회 RPC 없음)
+    wsol = get_wsol_maintainer()
+    wsol.reserve(lamports)
+
+    # 전송 (blockhash 만료 시 재서명 후 재전송)
+    try:
+        result = send_with_blockhash_retry(client, build_tx, opts=TxOpts(skip_preflight=True))
+    except Exception:
+        wsol.refund(lamports)
+        raise
+    wsol.sent(lamports, result.value)
     return result.value
 
 # ---------------------------------------------------------
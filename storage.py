@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+DB_FILE = os.getenv("BOT_DB_FILE", "bot.db")
+LEGACY_TOKENS_FILE = "tokens.json"
+LEGACY_NOTICE_FILE = "notice_messages.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    symbol   TEXT PRIMARY KEY,
+    chain    TEXT NOT NULL,
+    address  TEXT NOT NULL,
+    decimals INTEGER NOT NULL,
+    amount   REAL NOT NULL,
+    seq      INTEGER NOT NULL          -- 클수록 최근 등록
+);
+CREATE TABLE IF NOT EXISTS notice_messages (
+    symbol     TEXT PRIMARY KEY,
+    message_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS claims (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id    TEXT NOT NULL,
+    wallet     TEXT NOT NULL,
+    symbol     TEXT NOT NULL,
+    chain      TEXT NOT NULL,
+    amount     REAL NOT NULL,
+    tx_hash    TEXT,
+    created_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_claims_user_symbol ON claims (user_id, symbol);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_claims_wallet_symbol ON claims (wallet, symbol);
+CREATE TABLE IF NOT EXISTS menu_messages (
+    channel_id INTEGER PRIMARY KEY,
+    message_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_cache (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    result        TEXT NOT NULL,       -- 페이지에서 추출한 결과 (JSON)
+    fetched_at    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# -------------------------------------------------------------------
+# 🔹 SQLite 저장소 (WAL 모드)
+# -------------------------------------------------------------------
+class Store:
+    """토큰 / 공지 메시지 매핑 / 클레임 저장소 — 항목 단위 upsert, 트랜잭션 단위 커밋"""
+
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate_json()
+
+    def _write(self, sql: str, params=()):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                return self._conn.execute(sql, params)
+
+    def _read(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ---------------------------------------------------------------
+    # JSON → SQLite 1회 마이그레이션
+    # ---------------------------------------------------------------
+    def _migrate_json(self):
+        if self.get_meta("migrated_json"):
+            return
+
+        tokens = {}
+        if os.path.exists(LEGACY_TOKENS_FILE):
+            with open(LEGACY_TOKENS_FILE, "r", encoding="utf-8") as f:
+                tokens = json.load(f)
+        notice_map = {}
+        if os.path.exists(LEGACY_NOTICE_FILE):
+            with open(LEGACY_NOTICE_FILE, "r", encoding="utf-8") as f:
+                notice_map = json.load(f)
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                # tokens.json 은 최신 항목이 맨 앞 → 앞쪽일수록 큰 seq
+                for i, (symbol, data) in enumerate(tokens.items()):
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO tokens (symbol, chain, address, decimals, amount, seq) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (symbol, data["chain"], data["address"], data["decimals"], data["amount"], len(tokens) - i),
+                    )
+                for symbol, message_id in notice_map.items():
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO notice_messages (symbol, message_id) VALUES (?, ?)",
+                        (symbol, message_id),
+                    )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_json', ?)", (str(time.time()),)
+                )
+        print(f"📦 JSON → SQLite 마이그레이션 완료 (토큰 {len(tokens)}개, 공지 {len(notice_map)}개)")
+
+    # ---------------------------------------------------------------
+    # 토큰
+    # ---------------------------------------------------------------
+    def load_tokens(self) -> OrderedDict:
+        """최근 등록 순으로 정렬된 {symbol: data}"""
+        rows = self._read("SELECT symbol, chain, address, decimals, amount FROM tokens ORDER BY seq DESC")
+        return OrderedDict(
+            (symbol, {"chain": chain, "address": address, "decimals": decimals, "amount": amount})
+            for symbol, chain, address, decimals, amount in rows
+        )
+
+    def upsert_token(self, symbol: str, data: dict):
+        """등록/갱신 → 맨 앞(최신)으로"""
+        self._write(
+            "INSERT INTO tokens (symbol, chain, address, decimals, amount, seq) "
+            "VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM tokens)) "
+            "ON CONFLICT(symbol) DO UPDATE SET chain=excluded.chain, address=excluded.address, "
+            "decimals=excluded.decimals, amount=excluded.amount, seq=excluded.seq",
+            (symbol, data["chain"], data["address"], data["decimals"], data["amount"]),
+        )
+
+    # ---------------------------------------------------------------
+    # 공지 메시지 매핑
+    # ---------------------------------------------------------------
+    def notice_messages(self) -> dict:
+        return dict(self._read("SELECT symbol, message_id FROM notice_messages"))
+
+    def get_notice_message(self, symbol: str):
+        rows = self._read("SELECT message_id FROM notice_messages WHERE symbol = ?", (symbol,))
+        return rows[0][0] if rows else None
+
+    def set_notice_message(self, symbol: str, message_id: int):
+        self._write(
+            "INSERT OR REPLACE INTO notice_messages (symbol, message_id) VALUES (?, ?)", (symbol, message_id)
+        )
+
+    # ---------------------------------------------------------------
+    # 채널별 메뉴 메시지
+    # ---------------------------------------------------------------
+    def get_menu_message(self, channel_id: int):
+        rows = self._read("SELECT message_id FROM menu_messages WHERE channel_id = ?", (channel_id,))
+        return rows[0][0] if rows else None
+
+    def set_menu_message(self, channel_id: int, message_id: int):
+        self._write(
+            "INSERT OR REPLACE INTO menu_messages (channel_id, message_id) VALUES (?, ?)", (channel_id, message_id)
+        )
+
+    # ---------------------------------------------------------------
+    # 클레임 기록
+    # ---------------------------------------------------------------
+    def claim_keys(self) -> list:
+        """[(user_id, wallet, symbol), ...] — 시작 시 중복 체크용 인덱스 로딩"""
+        return self._read("SELECT user_id, wallet, symbol FROM claims")
+
+    def insert_claims(self, rows: list):
+        """rows: [(user_id, wallet, symbol, chain, amount, tx_hash, created_at), ...] 한 트랜잭션으로 추가"""
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO claims (user_id, wallet, symbol, chain, amount, tx_hash, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    # ---------------------------------------------------------------
+    # 크롤링 페이지 캐시 (URL → ETag / Last-Modified / 추출 결과)
+    # ---------------------------------------------------------------
+    def get_page_cache(self, url: str):
+        rows = self._read(
+            "SELECT etag, last_modified, result, fetched_at FROM page_cache WHERE url = ?", (url,)
+        )
+        if not rows:
+            return None
+        etag, last_modified, result, fetched_at = rows[0]
+        return {"etag": etag, "last_modified": last_modified, "result": json.loads(result), "fetched_at": fetched_at}
+
+    def set_page_cache(self, url: str, etag, last_modified, result):
+        self._write(
+            "INSERT OR REPLACE INTO page_cache (url, etag, last_modified, result, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (url, etag, last_modified, json.dumps(result, ensure_ascii=False), time.time()),
+        )
+
+    def touch_page_cache(self, url: str):
+        self._write("UPDATE page_cache SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    # ---------------------------------------------------------------
+    # 기타 key-value
+    # ---------------------------------------------------------------
+    def get_meta(self, key: str, default=None):
+        rows = self._read("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else default
+
+    def set_meta(self, key: str, value: str):
+        self._write("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+store = Store()
@@ -0,0 +1,70 @@
+import os
+import json
+import time
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+# tokens.json 과 같은 위치에 저장
+CACHE_FILE = "token_cache.json"
+CACHE_TTL_SEC = int(os.getenv("TOKEN_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+
+
+# -------------------------------------------------------------------
+# 🔹 토큰 메타데이터 캐시 (decimals / token program)
+# -------------------------------------------------------------------
+class TokenCache:
+    """
+    (chain, address) → {"decimals": .., "token_program": .., "cached_at": ..}
+    값이 바뀌지 않는 메타데이터를 디스크에 보관하고 TTL 이 지나면 다시 조회한다.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, ttl_sec: int = CACHE_TTL_SEC):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except Exception as e:
+                print(f"⚠️ 토큰 캐시 로드 실패 → 새로 생성: {e}")
+
+    @staticmethod
+    def _key(chain: str, address: str) -> str:
+        # EVM 주소는 대소문자 무관, Solana 주소는 대소문자 구분
+        if chain == "eth":
+            address = address.lower()
+        return f"{chain}:{address}"
+
+    def get(self, chain: str, address: str) -> dict:
+        """유효한 캐시 항목 (없거나 만료면 빈 dict)"""
+        with self._lock:
+            entry = self._entries.get(self._key(chain, address))
+        if not entry or time.time() - entry.get("cached_at", 0) > self.ttl_sec:
+            return {}
+        return entry
+
+    def update(self, chain: str, address: str, **fields):
+        with self._lock:
+            key = self._key(chain, address)
+            entry = dict(self._entries.get(key, {}))
+            entry.update(fields)
+            entry["cached_at"] = time.time()
+            self._entries[key] = entry
+            self._save_locked()
+
+    def _save_locked(self):
+        # 임시 파일에 쓰고 교체 → 중간에 죽어도 파일이 깨지지 않음
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+token_cache = TokenCache()
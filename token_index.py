@@ -0,0 +1,47 @@
+import bisect
+import heapq
+
+# 디스코드 셀렉트 메뉴 옵션 최대 개수
+PAGE_SIZE = 25
+
+
+# -------------------------------------------------------------------
+# 🔹 토큰 목록 인덱스 (페이지 / 접두사 검색)
+# -------------------------------------------------------------------
+class TokenIndex:
+    """
+    TOKENS(최신 등록이 맨 앞) 의 스냅샷.
+    - page(n): 최신순 n 번째 페이지 → 리스트 슬라이스 O(PAGE_SIZE)
+    - search(prefix): 정렬된 심볼 목록에서 bisect → O(log n + 결과 수 · log limit)
+    토큰이 등록/변경될 때만 rebuild 한다.
+    """
+
+    def __init__(self, tokens=None):
+        self.ordered = []
+        self._sorted = []   # [(소문자 심볼, 심볼), ...]
+        self._rank = {}     # 심볼 → 최신순 위치
+        if tokens:
+            self.rebuild(tokens)
+
+    def rebuild(self, tokens):
+        self.ordered = list(tokens)
+        self._rank = {symbol: i for i, symbol in enumerate(self.ordered)}
+        self._sorted = sorted((symbol.lower(), symbol) for symbol in self.ordered)
+
+    def page_count(self) -> int:
+        return max(1, (len(self.ordered) + PAGE_SIZE - 1) // PAGE_SIZE)
+
+    def page(self, n: int) -> list:
+        start = n * PAGE_SIZE
+        return self.ordered[start:start + PAGE_SIZE]
+
+    def search(self, prefix: str, limit: int = PAGE_SIZE) -> list:
+        """접두사가 일치하는 심볼 (최신순)"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return self.page(0)[:limit]
+        # 접두사 범위 전체 → 그중 최신순 상위 limit 개
+        lo = bisect.bisect_left(self._sorted, (prefix,))
+        hi = bisect.bisect_right(self._sorted, (prefix + "\uffff",))
+        matches = (symbol for _, symbol in self._sorted[lo:hi])
+        return heapq.nsmallest(limit, matches, key=self._rank.__getitem__)
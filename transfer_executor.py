@@ -0,0 +1,120 @@
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+import metrics
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정 (체인별 워커 수 / 대기열 한도)
+# -------------------------------------------------------------------
+ETH_WORKERS = int(os.getenv("ETH_TRANSFER_WORKERS", "4"))
+SOL_WORKERS = int(os.getenv("SOL_TRANSFER_WORKERS", "8"))
+MAX_PENDING = int(os.getenv("TRANSFER_MAX_PENDING", "500"))
+
+
+QUEUE_WAIT_SECONDS = metrics.histogram("transfer_queue_wait_seconds", "워커를 기다린 시간")
+JOB_SECONDS = metrics.histogram("transfer_job_seconds", "워커에서 실행된 체인 작업 시간")
+JOB_ERRORS = metrics.counter("transfer_job_errors_total", "예외로 끝난 체인 작업 수")
+
+
+class TransferQueueFull(Exception):
+    """체인별 대기열이 가득 찼을 때 발생"""
+
+
+# -------------------------------------------------------------------
+# 🔹 체인별 전송 실행기
+# -------------------------------------------------------------------
+class TransferExecutor:
+    """
+    블로킹 체인 호출(send_erc20 / send_spl_token 등)을 이벤트 루프 밖
+    체인별 스레드 풀에서 실행한다.
+    queued: 워커를 기다리는 작업 수 / in_flight: 실행 중인 작업 수
+    """
+
+    def __init__(self, workers: dict, max_pending: int = MAX_PENDING):
+        self.max_pending = max_pending
+        self._workers = dict(workers)
+        self._pools = {
+            chain: ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"transfer-{chain}")
+            for chain, n in workers.items()
+        }
+        self._queued = {chain: 0 for chain in workers}
+        self._in_flight = {chain: 0 for chain in workers}
+        self._lock = threading.Lock()
+
+    async def run(self, chain: str, fn, *args, **kwargs):
+        """fn(*args, **kwargs) 를 chain 풀에서 실행하고 결과를 기다린다"""
+        pool = self._pools.get(chain)
+        if pool is None:
+            raise ValueError(f"❌ 지원하지 않는 체인입니다: {chain}")
+
+        with self._lock:
+            if self._queued[chain] + self._in_flight[chain] >= self.max_pending:
+                raise TransferQueueFull(f"{chain} 전송 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+            self._queued[chain] += 1
+
+        state = {"started": False}
+        enqueued_at = time.perf_counter()
+        name = getattr(fn, "__name__", "?")
+
+        def job():
+            with self._lock:
+                if not state["started"]:
+                    self._queued[chain] -= 1
+                    state["started"] = True
+                self._in_flight[chain] += 1
+            start = time.perf_counter()
+            QUEUE_WAIT_SECONDS.observe(start - enqueued_at, chain=chain)
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                JOB_ERRORS.inc(chain=chain, fn=name)
+                raise
+            finally:
+                JOB_SECONDS.observe(time.perf_counter() - start, chain=chain, fn=name)
+                with self._lock:
+                    self._in_flight[chain] -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, job)
+        finally:
+            # 워커가 잡기 전에 취소된 작업은 대기 수에서 직접 빼준다
+            with self._lock:
+                if not state["started"]:
+                    self._queued[chain] -= 1
+                    state["started"] = True
+
+    def stats(self) -> dict:
+        """체인별 대기/실행 중 작업 수"""
+        with self._lock:
+            return {
+                chain: {
+                    "workers": self._workers[chain],
+                    "queued": self._queued[chain],
+                    "in_flight": self._in_flight[chain],
+                }
+                for chain in self._pools
+            }
+
+    def shutdown(self, wait: bool = False):
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# 봇 전체에서 공유하는 실행기
+transfer_executor = TransferExecutor({"eth": ETH_WORKERS, "sol": SOL_WORKERS})
+
+metrics.gauge(
+    "transfer_queue_depth", "체인별 대기(queued) / 실행 중(in_flight) 작업 수",
+    lambda: [
+        ({"chain": chain, "state": state}, stats[state])
+        for chain, stats in transfer_executor.stats().items()
+        for state in ("queued", "in_flight")
+    ],
+)
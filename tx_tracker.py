@@ -0,0 +1,118 @@
+import os
+import time
+import asyncio
+from dotenv import load_dotenv
+
+from transfer_executor import transfer_executor
+
+load_dotenv()
+
+CONFIRM_TIMEOUT_SEC = float(os.getenv("CONFIRM_TIMEOUT_SEC", "180"))
+
+
+class TransactionFailed(Exception):
+    """트랜잭션이 체인에 포함됐지만 실패한 경우"""
+
+
+# -------------------------------------------------------------------
+# 🔹 트랜잭션 확정 추적기
+# -------------------------------------------------------------------
+class ConfirmationTracker:
+    """
+    대기 중인 트랜잭션 전체를 루프 하나가 모아서 폴링한다 (점점 간격을 늘리는 backoff).
+    fetch_statuses(tx_list) → {tx: "confirmed" | "failed" | None}
+    head_fn() 이 있으면 값(블록 번호 등)이 바뀌었을 때만 fetch_statuses 를 호출한다.
+    """
+
+    def __init__(self, chain: str, fetch_statuses, head_fn=None,
+                 poll_min: float = 0.5, poll_max: float = 5.0, timeout: float = CONFIRM_TIMEOUT_SEC):
+        self.chain = chain
+        self.fetch_statuses = fetch_statuses
+        self.head_fn = head_fn
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.timeout = timeout
+        self._waiters = {}   # tx → [(future, deadline), ...]
+        self._task = None
+        self._wakeup = None
+        self._last_head = None
+
+    async def _call(self, fn, *args):
+        return await transfer_executor.run(self.chain, fn, *args)
+
+    async def wait(self, tx: str, timeout: float = None):
+        """tx 확정까지 대기 (실패 → TransactionFailed, 시간 초과 → asyncio.TimeoutError)"""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        deadline = time.monotonic() + (timeout or self.timeout)
+        self._waiters.setdefault(tx, []).append((fut, deadline))
+
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        else:
+            self._wakeup.set()  # 새 트랜잭션 → 바로 한 번 확인
+        return await fut
+
+    def pending_count(self) -> int:
+        return len(self._waiters)
+
+    async def _run(self):
+        interval = self.poll_min
+        while self._waiters:
+            resolved = await self._poll_once()
+            self._expire()
+            if not self._waiters:
+                break
+
+            interval = self.poll_min if resolved else min(interval * 1.5, self.poll_max)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+                interval = self.poll_min
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _poll_once(self) -> int:
+        try:
+            if self.head_fn is not None:
+                head = await self._call(self.head_fn)
+                if head == self._last_head:
+                    return 0
+                self._last_head = head
+
+            txs = list(self._waiters)
+            statuses = await self._call(self.fetch_statuses, txs)
+        except Exception as e:
+            print(f"⚠️ {self.chain} 확정 조회 실패: {e}")
+            return 0
+
+        resolved = 0
+        for tx, status in statuses.items():
+            if status is None or tx not in self._waiters:
+                continue
+            for fut, _ in self._waiters.pop(tx):
+                if fut.done():
+                    continue
+                if status == "failed":
+                    fut.set_exception(TransactionFailed(f"{self.chain} 트랜잭션 실패: {tx}"))
+                else:
+                    fut.set_result(tx)
+            resolved += 1
+        return resolved
+
+    def _expire(self):
+        now = time.monotonic()
+        for tx in list(self._waiters):
+            alive = []
+            for fut, deadline in self._waiters[tx]:
+                if fut.done():
+                    continue
+                if now >= deadline:
+                    fut.set_exception(asyncio.TimeoutError(f"{self.chain} 트랜잭션 확정 시간 초과: {tx}"))
+                else:
+                    alive.append((fut, deadline))
+            if alive:
+                self._waiters[tx] = alive
+            else:
+                del self._waiters[tx]
@@ -0,0 +1,84 @@
+import math
+import re
+
+from chain_backends import lazy
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+# 네트워크 없이 로컬 계산만 (모달 제출 직후, 큐에 넣기 전)
+EVM_ADDRESS_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
+SOLANA_ADDRESS_RE = re.compile(r"^[1-9A-HJ-NP-Za-km-z]{32,44}$")   # base58 문자만
+
+# eth_utils 는 web3 와 함께 설치됨 — 봇 로그인 전에 불러오지 않도록 호출 시점에 import
+to_checksum_address = lazy("eth_utils", "to_checksum_address")
+is_checksum_address = lazy("eth_utils", "is_checksum_address")
+
+
+class InvalidAddress(Exception):
+    """받는 지갑 주소 / 수량이 잘못된 경우 (사용자에게 그대로 보여줄 메시지)"""
+
+
+def parse_solana_pubkey(value: str):
+    """base58 32바이트 공개키 → Pubkey (아니면 None)"""
+    from solders.pubkey import Pubkey   # 지연 import (chain_backends.lazy 와 같은 이유)
+    if not SOLANA_ADDRESS_RE.match(value):
+        return None
+    try:
+        return Pubkey.from_string(value)
+    except ValueError:
+        return None
+
+
+# -------------------------------------------------------------------
+# 🔹 체인별 주소 검증
+# -------------------------------------------------------------------
+def validate_evm_address(value: str) -> str:
+    """체크섬 주소 반환 (대소문자가 섞여 있으면 EIP-55 체크섬 확인)"""
+    if not EVM_ADDRESS_RE.match(value):
+        if parse_solana_pubkey(value) is not None:
+            raise InvalidAddress("솔라나 지갑 주소입니다. 이 토큰은 이더리움 지갑 주소(0x...)로 받아야 합니다.")
+        raise InvalidAddress("이더리움 지갑 주소는 0x 로 시작하는 40자리 16진수입니다.")
+    body = value[2:]
+    if body != body.lower() and body != body.upper() and not is_checksum_address(value):
+        raise InvalidAddress("주소 체크섬이 맞지 않습니다. 오타가 없는지 확인해주세요.")
+    return to_checksum_address(value)
+
+
+def validate_solana_address(value: str) -> str:
+    if EVM_ADDRESS_RE.match(value):
+        raise InvalidAddress("이더리움 지갑 주소입니다. 이 토큰은 솔라나 지갑 주소로 받아야 합니다.")
+    pubkey = parse_solana_pubkey(value)
+    if pubkey is None:
+        raise InvalidAddress("솔라나 지갑 주소는 32~44자리 base58 문자열입니다. 오타가 없는지 확인해주세요.")
+    if not pubkey.is_on_curve():
+        raise InvalidAddress("프로그램 주소(PDA)로는 받을 수 없습니다. 일반 지갑 주소를 입력해주세요.")
+    return value
+
+
+VALIDATORS = {
+    "eth": validate_evm_address,
+    "sol": validate_solana_address,
+}
+
+
+def validate_claim(token: dict, wallet: str) -> str:
+    """
+    모달 제출 직후 호출 (RPC / 큐 전에) — 정규화된 받는 주소 반환, 잘못되면 InvalidAddress
+    token: TOKENS 항목 {"chain", "amount", ...}
+    """
+    validator = VALIDATORS.get(token.get("chain"))
+    if validator is None:
+        raise InvalidAddress("지원하지 않는 체인입니다.")
+
+    try:
+        amount = float(token.get("amount"))
+    except (TypeError, ValueError):
+        amount = math.nan
+    if not math.isfinite(amount) or amount <= 0:
+        raise InvalidAddress("토큰 지급 수량 설정이 잘못되었습니다. 관리자에게 문의해주세요.")
+
+    wallet = (wallet or "").strip()
+    if not wallet:
+        raise InvalidAddress("지갑 주소를 입력해주세요.")
+    return validator(wallet)
@@ -0,0 +1,114 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 메모리 잔액을 이 시간이 지나면 체인에서 다시 읽음 (외부 입금 / 수동 충전 반영)
+WALLET_BALANCE_TTL_SEC = float(os.getenv("WALLET_BALANCE_TTL_SEC", "300"))
+# 잔액 조회가 실패한 지갑은 이 시간 동안 잔액 0 으로 보고 다시 조회하지 않음
+WALLET_BALANCE_RETRY_SEC = float(os.getenv("WALLET_BALANCE_RETRY_SEC", "10"))
+
+
+def load_keys(list_env: str, single_env: str) -> list:
+    """콤마로 구분된 키 목록 (없으면 기존 단일 키)"""
+    keys = [k.strip() for k in (os.getenv(list_env) or "").split(",") if k.strip()]
+    if not keys and os.getenv(single_env):
+        keys = [os.getenv(single_env).strip()]
+    return keys
+
+
+class InsufficientBalance(Exception):
+    """풀의 어떤 지갑도 전송할 만큼의 토큰을 갖고 있지 않은 경우"""
+
+
+class HotWallet:
+    def __init__(self, address: str, signer):
+        self.address = address
+        self.signer = signer          # ETH: 개인키 문자열 / SOL: Keypair
+        self.busy = 0                 # 진행 중인 전송 수
+        self.balances = {}            # 토큰 → (raw 잔액, 만료 시각)
+
+    def __repr__(self):
+        return f"HotWallet({self.address}, busy={self.busy})"
+
+
+# -------------------------------------------------------------------
+# 🔹 체인별 핫월렛 풀
+# -------------------------------------------------------------------
+class WalletPool:
+    """
+    전송마다 잔액이 충분한 지갑 중 진행 중인 전송이 가장 적은 지갑을 고른다.
+    잔액은 메모리에서 차감하고, 모르는(또는 오래된) 잔액만 fetch_balance(wallet, token) 으로 조회한다.
+    """
+
+    def __init__(self, chain: str, wallets: list, fetch_balance, ttl: float = WALLET_BALANCE_TTL_SEC):
+        self.chain = chain
+        self.wallets = list(wallets)
+        self.fetch_balance = fetch_balance
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self) -> HotWallet:
+        if not self.wallets:
+            raise RuntimeError(f"❌ {self.chain} 지갑 키가 설정되지 않았습니다.")
+        return self.wallets[0]
+
+    def _known_balance(self, wallet: HotWallet, token: str):
+        entry = wallet.balances.get(token)
+        if entry is None or time.monotonic() > entry[1]:
+            return None
+        return entry[0]
+
+    def _refresh(self, token: str, wallets: list):
+        """잔액을 모르는 지갑만 조회 (락 밖에서) — 실패하면 잠깐 0 으로 캐시 (클레임마다 재조회 방지)"""
+        for wallet in wallets:
+            try:
+                balance, ttl = self.fetch_balance(wallet, token), self.ttl
+            except Exception as e:
+                print(f"⚠️ {self.chain} 지갑 잔액 조회 실패 ({wallet.address}): {e}")
+                balance, ttl = 0, WALLET_BALANCE_RETRY_SEC
+            with self._lock:
+                wallet.balances[token] = (balance, time.monotonic() + ttl)
+
+    def acquire(self, token: str, amount: int, wallet: HotWallet = None) -> HotWallet:
+        """amount 만큼 잔액을 예약하고 지갑 반환 (wallet 지정 시 그 지갑 사용)"""
+        candidates = [wallet] if wallet is not None else self.wallets
+        with self._lock:
+            unknown = [w for w in candidates if self._known_balance(w, token) is None]
+        if unknown:
+            self._refresh(token, unknown)
+
+        with self._lock:
+            usable = [w for w in candidates if (self._known_balance(w, token) or 0) >= amount]
+            if not usable:
+                raise InsufficientBalance(f"{self.chain} 핫월렛 잔액 부족 (필요 {amount})")
+            chosen = min(usable, key=lambda w: (w.busy, -self._known_balance(w, token)))
+            balance, expires_at = chosen.balances[token]
+            chosen.balances[token] = (balance - amount, expires_at)
+            chosen.busy += 1
+            return chosen
+
+    def release(self, wallet: HotWallet, token: str, amount: int, sent: bool):
+        """전송 끝 — 실패면 전송 여부가 불확실하므로 메모리 잔액을 버리고 다음에 체인에서 다시 읽음"""
+        with self._lock:
+            wallet.busy -= 1
+            if not sent:
+                wallet.balances.pop(token, None)
+
+    @contextmanager
+    def use(self, token: str, amount: int, wallet: HotWallet = None):
+        chosen = self.acquire(token, amount, wallet)
+        try:
+            yield chosen
+        except BaseException:
+            self.release(chosen, token, amount, sent=False)
+            raise
+        self.release(chosen, token, amount, sent=True)
+
+    def stats(self) -> list:
+        with self._lock:
+            return [{"address": w.address, "busy": w.busy} for w in self.wallets]
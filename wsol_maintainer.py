@@ -0,0 +1,177 @@
+import os
+import time
+import threading
+from dotenv import load_dotenv
+
+from solders.signature import Signature
+
+from blockhash_cache import current_signature, is_landed
+
+load_dotenv()
+
+# -------------------------------------------------------------------
+# ⚙️ 설정
+# -------------------------------------------------------------------
+# 잔액이 FLOOR 아래로 내려가면 TARGET 까지 한 번에 래핑 (스왑마다 래핑하지 않도록 여유분 확보)
+WSOL_FLOOR_LAMPORTS = int(os.getenv("WSOL_FLOOR_LAMPORTS", "7500000"))
+WSOL_TARGET_LAMPORTS = int(os.getenv("WSOL_TARGET_LAMPORTS", str(WSOL_FLOOR_LAMPORTS * 2)))
+WSOL_RESYNC_SEC = float(os.getenv("WSOL_RESYNC_SEC", "60"))          # 체인 잔액 재확인 주기
+WSOL_CONFIRM_TIMEOUT_SEC = float(os.getenv("WSOL_CONFIRM_TIMEOUT_SEC", "150"))   # 만료 → 재전송 1회까지 포함
+WSOL_RESERVE_TIMEOUT_SEC = float(os.getenv("WSOL_RESERVE_TIMEOUT_SEC", "30"))
+# 전송한 스왑이 이 시간 안에 확정 / 실패로 끝나지 않으면 (재전송 포기) 차감 예약을 풀어줌
+WSOL_IN_FLIGHT_MAX_SEC = float(os.getenv("WSOL_IN_FLIGHT_MAX_SEC", "300"))
+
+
+class WsolUnavailable(Exception):
+    """스왑에 쓸 wSOL 잔액이 제때 준비되지 않은 경우"""
+
+
+# -------------------------------------------------------------------
+# 🔹 wSOL 잔액 백그라운드 유지
+# -------------------------------------------------------------------
+class WsolMaintainer:
+    """
+    wSOL ATA 잔액을 메모리에 들고 있다가 FLOOR 아래로 내려가면 백그라운드에서 래핑 + 확정까지 기다린다.
+    스왑 경로는 reserve() 로 캐시된 잔액만 차감한다 (RPC 0회).
+    보낸 스왑은 sent() 로 등록 → 확정되기 전까지는 체인 잔액에 아직 남아 있으므로 재동기화 때 빼고 계산한다.
+    wrap(lamports, create_ata) → 서명
+    """
+
+    def __init__(self, client, wsol_ata, wrap, floor: int = WSOL_FLOOR_LAMPORTS,
+                 target: int = WSOL_TARGET_LAMPORTS, resync_sec: float = WSOL_RESYNC_SEC):
+        self.client = client
+        self.wsol_ata = wsol_ata
+        self.wrap = wrap
+        self.floor = floor
+        self.target = max(target, floor)
+        self.resync_sec = resync_sec
+        self._cond = threading.Condition()
+        self._balance = None      # None = 아직 조회 전
+        self._wanted = 0          # 대기 중인 reserve 가 요구한 금액 (FLOOR 보다 클 때 대비)
+        self._unsent = 0          # reserve 됐지만 아직 전송 전인 금액
+        self._in_flight = {}      # 전송한 스왑 서명 → (lamports, 전송 시각) — 확정 전까지 체인 잔액에 포함돼 있음
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="wsol-maintainer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.maintain()
+            except Exception as e:
+                print(f"⚠️ wSOL 잔액 유지 실패: {e}")
+            self._wake.wait(self.resync_sec)
+            self._wake.clear()
+
+    def _fetch_balance(self):
+        """체인 잔액 (ATA 가 없으면 None — RPC 가 .value 없는 에러 응답을 줌)"""
+        value = getattr(self.client.get_token_account_balance(self.wsol_ata), "value", None)
+        return int(value.amount) if value is not None else None
+
+    def _settle_in_flight(self):
+        """확정 / 실패로 끝난 스왑은 예약 목록에서 제거 (체인 잔액에 이미 반영됐거나 쓰이지 않음)"""
+        with self._cond:
+            sigs = list(self._in_flight)
+        if not sigs:
+            return
+        statuses = self.client.get_signature_statuses(
+            [Signature.from_string(current_signature(sig)) for sig in sigs]
+        ).value
+        now = time.monotonic()
+        with self._cond:
+            for sig, status in zip(sigs, statuses):
+                entry = self._in_flight.get(sig)
+                if entry is not None and (is_landed(status) or now - entry[1] > WSOL_IN_FLIGHT_MAX_SEC):
+                    del self._in_flight[sig]
+
+    def sync(self):
+        """
+        캐시 잔액 = 체인 잔액 - 아직 확정 안 된 스왑 예약 (체인 잔액 반환, ATA 가 없으면 None)
+        서명 상태를 잔액보다 먼저 조회 → 그 사이 확정된 스왑은 두 번 빠질 뿐 (부족하게 보는 쪽으로만 어긋남)
+        """
+        self._settle_in_flight()
+        onchain = self._fetch_balance()
+        with self._cond:
+            pending = self._unsent + sum(lamports for lamports, _ in self._in_flight.values())
+            self._balance = max(0, (onchain or 0) - pending)
+            self._cond.notify_all()
+        return onchain
+
+    def maintain(self):
+        onchain = self.sync()
+        balance = self.balance()
+        floor = max(self.floor, self._wanted)
+        if balance >= floor:
+            return
+
+        target = max(self.target, self._wanted)
+        wrap_amount = target - balance
+        print(f"[INFO] wSOL {balance} lamports → {wrap_amount} lamports 래핑 (목표: {target})")
+        sig = self.wrap(wrap_amount, onchain is None)
+        self._wait_confirmed(sig)
+        self.sync()
+        print(f"[INFO] wSOL 래핑 확정: {sig} (잔액 {self._balance})")
+
+    def _wait_confirmed(self, sig):
+        deadline = time.monotonic() + WSOL_CONFIRM_TIMEOUT_SEC
+        delay = 0.5
+        while time.monotonic() < deadline and not self._stop.is_set():
+            status = self.client.get_signature_statuses([Signature.from_string(current_signature(sig))]).value[0]
+            if status is not None:
+                if status.err is not None:
+                    raise Exception(f"wSOL 래핑 실패: {status.err}")
+                if status.confirmation_status is not None and str(status.confirmation_status).lower().endswith(("confirmed", "finalized")):
+                    return
+            time.sleep(delay)
+            delay = min(delay * 1.5, 3.0)
+        raise TimeoutError(f"wSOL 래핑 확정 대기 시간 초과: {sig}")
+
+    def balance(self):
+        """캐시된 wSOL 잔액 (lamports, 조회 전이면 None)"""
+        with self._cond:
+            return self._balance
+
+    def reserve(self, lamports: int, timeout: float = WSOL_RESERVE_TIMEOUT_SEC):
+        """스왑 직전 — 캐시 잔액에서 차감, 부족하면 래핑이 끝날 때까지 대기"""
+        self.start()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._balance is None or self._balance < lamports:
+                self._wanted = max(self._wanted, lamports)
+                self._wake.set()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._wanted = 0
+                    raise WsolUnavailable(f"wSOL 부족 (필요 {lamports}, 보유 {self._balance})")
+                self._cond.wait(remaining)
+            self._wanted = 0
+            self._balance -= lamports
+            self._unsent += lamports
+            low = self._balance < self.floor
+        if low:
+            self._wake.set()
+
+    def sent(self, lamports: int, sig):
+        """스왑 전송 완료 → 확정될 때까지 재동기화에서 빼고 계산"""
+        with self._cond:
+            self._unsent -= lamports
+            self._in_flight[str(sig)] = (lamports, time.monotonic())
+
+    def refund(self, lamports: int):
+        """스왑 전송 실패 → 차감분 복구"""
+        with self._cond:
+            self._unsent -= lamports
+            if self._balance is not None:
+                self._balance += lamports
+                self._cond.notify_all()